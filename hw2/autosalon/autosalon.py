@@ -1,4 +1,25 @@
-from typing import List
+import weakref
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Sequence
+from itertools import compress, repeat
+from math import inf
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _notify(instance, field: str, old, new):
+    """Сообщить инвентарям машины о смене поля; ссылки на уже удаленные инвентари выбросить"""
+    observers = instance._observers
+    dead = False
+    for ref in observers:
+        observer = ref()
+        if observer is None:
+            dead = True
+        else:
+            observer.field_changed(instance, field, old, new)
+    if dead:
+        instance._observers = [ref for ref in observers if ref() is not None] or None
+
 
 class StringValue:
     def __init__(self, min_length: int, max_length: int):
@@ -12,15 +33,29 @@ class StringValue:
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return instance.__dict__.get(self.private_name)
+        return getattr(instance, self.private_name, None)
+
+    def is_valid(self, value) -> bool:
+        return isinstance(value, str) and self.min_length <= len(value) <= self.max_length
+
+    def check_column(self, values: Sequence) -> Optional[List[bool]]:
+        """Проверить столбец значений разом; None — годятся все, иначе флаги по элементам"""
+        if set(map(type, values)) <= {str}:
+            lengths = list(map(len, values)) or [self.min_length]
+            if self.min_length <= min(lengths) and max(lengths) <= self.max_length:
+                return None
+        return list(map(self.is_valid, values))
 
     def __set__(self, instance, value):
-        if not isinstance(value, str):
+        if not self.is_valid(value):
             return
-        length = len(value)
-        if length < self.min_length or length > self.max_length:
+        observers = getattr(instance, "_observers", None)
+        if not observers:
+            setattr(instance, self.private_name, value)
             return
-        instance.__dict__[self.private_name] = value
+        old = getattr(instance, self.private_name, None)
+        setattr(instance, self.private_name, value)
+        _notify(instance, self.public_name, old, value)
 
 
 class PriceValue:
@@ -34,37 +69,275 @@ class PriceValue:
     def __get__(self, instance, owner):
         if instance is None:
             return self
-        return instance.__dict__.get(self.private_name)
+        return getattr(instance, self.private_name, None)
+
+    def is_valid(self, value) -> bool:
+        return isinstance(value, (int, float)) and not (value < 0 or value > self.max_value)
+
+    def check_column(self, values: Sequence) -> Optional[List[bool]]:
+        """Проверить столбец значений разом; None — годятся все, иначе флаги по элементам"""
+        if set(map(type, values)) <= {int, float}:
+            # NaN проходит проверку, как и в __set__; min/max дают NaN, только если он первый
+            lowest = min(values, default=0)
+            highest = max(values, default=0)
+            if lowest == lowest and highest == highest and 0 <= lowest and highest <= self.max_value:
+                return None
+        return list(map(self.is_valid, values))
 
     def __set__(self, instance, value):
-        if not isinstance(value, (int, float)):
+        if not self.is_valid(value):
             return
-        if value < 0 or value > self.max_value:
+        observers = getattr(instance, "_observers", None)
+        if not observers:
+            setattr(instance, self.private_name, value)
             return
-        instance.__dict__[self.private_name] = value
+        old = getattr(instance, self.private_name, None)
+        setattr(instance, self.private_name, value)
+        _notify(instance, self.public_name, old, value)
 
 
 class Car:
+    # Значения дескрипторов хранятся в слотах `_name` и `_price`, а не в __dict__;
+    # `_observers` — слабые ссылки на инвентари, которым дескрипторы сообщают о смене
+    # полей: машина не продлевает жизнь инвентарю, из которого ее не удалили
+    __slots__ = ("_name", "_price", "_observers")
+
     name = StringValue(min_length=2, max_length=50)
     price = PriceValue(max_value=1_000_000)
 
     def __init__(self, name: str, price: float):
+        # Пустой слот дескрипторы читают через исключение, так что задаем его сразу
+        self._observers = None
         self.name = name
         self.price = price
 
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, float]]) -> List["Car"]:
+        """Создать машины из пар (имя, цена); то же, что Car(name, price) для каждой пары"""
+        records = list(records)
+        if any(len(record) != 2 for record in records):
+            raise ValueError("Каждая запись должна быть парой (имя, цена)")
+        names, prices = zip(*records) if records else ((), ())
+        return cls.from_columns(names, prices)
+
+    @classmethod
+    def from_columns(cls, names: Sequence[str], prices: Sequence[float]) -> List["Car"]:
+        """Создать машины из столбцов имен и цен, проверяя каждый столбец целиком"""
+        if len(names) != len(prices):
+            raise ValueError("Столбцы имен и цен разной длины")
+        name_key = cls.name.private_name
+        price_key = cls.price.private_name
+        names_ok = cls.name.check_column(names)
+        prices_ok = cls.price.check_column(prices)
+
+        # Экземпляры создаются без __init__, а поля пишутся прямо в слоты,
+        # минуя проверку дескриптором каждого значения по отдельности
+        cars = list(map(object.__new__, repeat(cls, len(names))))
+        list(map(setattr, cars, repeat("_observers"), repeat(None, len(cars))))
+        if names_ok is None:
+            list(map(setattr, cars, repeat(name_key), names))
+        else:
+            list(map(setattr, compress(cars, names_ok), repeat(name_key), compress(names, names_ok)))
+        if prices_ok is None:
+            list(map(setattr, cars, repeat(price_key), prices))
+        else:
+            list(map(setattr, compress(cars, prices_ok), repeat(price_key), compress(prices, prices_ok)))
+        return cars
+
+    def __reduce__(self):
+        # Копия (copy, deepcopy, pickle) — новая машина с теми же полями, но вне инвентарей
+        return type(self), (self.name, self.price)
+
     def __repr__(self):
         return f"Car(name={self.name!r}, price={self.price!r})"
 
 
+def _is_priced(price) -> bool:
+    """Попадает ли цена в индекс цен: неустановленная цена и NaN не сравнимы с другими"""
+    return price is not None and price == price
+
+
+class Inventory:
+    """Машины с индексами по имени и по цене.
+
+    Машины хранятся в словаре по самим объектам (сравнение по идентичности),
+    так что проверка и поиск машины для удаления — O(1), а обход идет в
+    порядке добавления. Индекс имен — словарь имя -> машины; индекс цен —
+    список `(цена, номер, машина)`, отсортированный для `bisect`: запрос
+    диапазона стоит O(log n + ответ). Машина помнит слабые ссылки на свои
+    инвентари в `_observers`, и дескрипторы сообщают им о смене `name` и
+    `price`, поэтому индексы остаются согласованными.
+
+    Для доступа по номеру `snapshot` собирает кортеж машин и хранит его до
+    следующего `add`/`remove`. Одна машина входит в инвентарь не больше раза.
+    """
+
+    def __init__(self, cars: Iterable[Car] = ()):
+        self._serials: Dict[Car, int] = {}
+        self._by_name: Dict[Optional[str], Dict[Car, None]] = {}
+        self._by_price: List[Tuple[float, int, Car]] = []
+        self._next_serial = 0
+        self._snapshot: Optional[Tuple[Car, ...]] = None
+        for car in cars:
+            self.add(car)
+
+    def __len__(self) -> int:
+        return len(self._serials)
+
+    def __iter__(self) -> Iterator[Car]:
+        return iter(self._serials)
+
+    def __contains__(self, car) -> bool:
+        return car in self._serials
+
+    def snapshot(self) -> Tuple[Car, ...]:
+        """Машины в порядке добавления; кортеж пересобирается только после изменений"""
+        if self._snapshot is None:
+            self._snapshot = tuple(self._serials)
+        return self._snapshot
+
+    def add(self, car: Car):
+        """Добавить машину; ValueError, если она уже есть"""
+        if car in self._serials:
+            raise ValueError(f"{car!r} уже есть в инвентаре")
+        self._snapshot = None
+        serial = self._next_serial
+        self._next_serial += 1
+        self._serials[car] = serial
+        self._index_name(car, car.name)
+        self._index_price(car, car.price, serial)
+
+        observers = getattr(car, "_observers", None)
+        if observers is None:
+            car._observers = [weakref.ref(self)]
+        else:
+            observers.append(weakref.ref(self))
+
+    def remove(self, car: Car):
+        """Удалить машину; KeyError, если ее нет"""
+        serial = self._serials.pop(car)
+        self._snapshot = None
+        self._unindex_name(car, car.name)
+        self._unindex_price(car.price, serial)
+        car._observers.remove(weakref.ref(self))
+
+    def discard(self, car: Car):
+        """Удалить машину, если она есть"""
+        if car in self._serials:
+            self.remove(car)
+
+    def by_name(self, name: str) -> List[Car]:
+        return list(self._by_name.get(name, ()))
+
+    def by_price(self, low: float, high: float) -> List[Car]:
+        """Машины с ценой в отрезке [low; high] по возрастанию цены"""
+        start = bisect_left(self._by_price, (low,))
+        stop = bisect_right(self._by_price, (high, inf))
+        return [car for _, _, car in self._by_price[start:stop]]
+
+    def field_changed(self, car: Car, field: str, old, new):
+        """Перенести машину в индексе поля `field` со значения `old` на `new`"""
+        if car not in self._serials:
+            return
+        if field == "name":
+            self._unindex_name(car, old)
+            self._index_name(car, new)
+        elif field == "price":
+            serial = self._serials[car]
+            self._unindex_price(old, serial)
+            self._index_price(car, new, serial)
+
+    def _index_name(self, car: Car, name: Optional[str]):
+        self._by_name.setdefault(name, {})[car] = None
+
+    def _unindex_name(self, car: Car, name: Optional[str]):
+        cars = self._by_name[name]
+        del cars[car]
+        if not cars:
+            del self._by_name[name]
+
+    def _index_price(self, car: Car, price, serial: int):
+        if _is_priced(price):
+            insort(self._by_price, (price, serial, car))
+
+    def _unindex_price(self, price, serial: int):
+        if _is_priced(price):
+            del self._by_price[bisect_left(self._by_price, (price, serial))]
+
+
+class CarsView(Sequence):
+    """Машины инвентаря в порядке добавления с интерфейсом списка.
+
+    Вид живой: он отражает последующие `add`/`remove`. Номер, обход и сравнение
+    берут `Inventory.snapshot`, поэтому без изменений между обращениями доступ
+    по номеру стоит O(1), а проверка `in` — всегда O(1). Обход идет по снимку,
+    так что машины можно удалять прямо в цикле. Вид равен списку или кортежу
+    тех же машин.
+
+    `append`/`extend` добавляют в конец, `remove` удаляет, как у списка. Одна
+    машина не может войти дважды (`ValueError`), а вставки в середину и
+    присваивания по номеру нет: порядок задается только добавлением.
+    """
+
+    __slots__ = ("_inventory",)
+
+    def __init__(self, inventory: Inventory):
+        self._inventory = inventory
+
+    def __len__(self) -> int:
+        return len(self._inventory)
+
+    def __iter__(self) -> Iterator[Car]:
+        return iter(self._inventory.snapshot())
+
+    def __contains__(self, car) -> bool:
+        return car in self._inventory
+
+    def __getitem__(self, index):
+        cars = self._inventory.snapshot()[index]
+        return list(cars) if isinstance(index, slice) else cars
+
+    def __eq__(self, other):
+        if isinstance(other, CarsView):
+            return self._inventory.snapshot() == other._inventory.snapshot()
+        if isinstance(other, (list, tuple)):
+            return self._inventory.snapshot() == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def append(self, car: Car):
+        self._inventory.add(car)
+
+    def extend(self, cars: Iterable[Car]):
+        for car in cars:
+            self._inventory.add(car)
+
+    def remove(self, car: Car):
+        """Удалить машину; ValueError, если ее нет, как у списка"""
+        if car not in self._inventory:
+            raise ValueError(f"{car!r} нет среди машин")
+        self._inventory.remove(car)
+
+    def __repr__(self):
+        return f"CarsView({list(self._inventory.snapshot())!r})"
+
+
 class AutoSalon:
     name = StringValue(min_length=3, max_length=100)
-    cars: List[Car] = []
 
     def __init__(self, name: str):
         self.name = name
+        self.inventory = Inventory()
+
+    @property
+    def cars(self) -> CarsView:
+        """Машины в порядке добавления как список (`CarsView`); поиск по имени и цене — через `inventory`"""
+        return CarsView(self.inventory)
 
     def add_car(self, car: Car):
-        self.cars.append(car)
+        """Добавить машину в конец `cars`; ValueError, если она уже в автосалоне"""
+        self.inventory.add(car)
 
     def remove_car(self, car: Car):
-        self.cars.remove(car)
+        self.inventory.discard(car)
@@ -0,0 +1,66 @@
+import gc
+import time
+import tracemalloc
+
+from argparse import ArgumentParser
+
+from autosalon import Car, PriceValue, StringValue
+
+
+class DictCar:
+    """Машина со значениями дескрипторов в __dict__ — для сравнения со слотами `Car`"""
+
+    name = StringValue(min_length=2, max_length=50)
+    price = PriceValue(max_value=1_000_000)
+
+    def __init__(self, name: str, price: float):
+        self.name = name
+        self.price = price
+
+
+def get_parser() -> ArgumentParser:
+    """Получить парсер аргументов командной строки."""
+    parser = ArgumentParser(prog="benchmark", description="Память и скорость создания машин автосалона.")
+    parser.add_argument("--cars", type=int, default=10**6, help="число машин")
+    return parser
+
+
+def bench_memory(cls: type, names: list[str], prices: list[float]) -> dict[str, float]:
+    """Память машин класса `cls` вместе со списком; строки и числа созданы заранее и не считаются."""
+    gc.collect()
+    tracemalloc.start()
+    cars = [cls(name, price) for name, price in zip(names, prices)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cars
+    return {"cars": len(names), "bytes": size, "bytes_per_car": size / len(names)}
+
+
+def bench_build(build, names: list[str], prices: list[float]) -> float:
+    """Секунд на создание всех машин способом `build`."""
+    gc.collect()
+    start = time.perf_counter()
+    build(names, prices)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Запустить замеры."""
+    args = get_parser().parse_args(argv)
+    names = [f"Car {number}" for number in range(args.cars)]
+    prices = [float(number % 1_000_000) for number in range(args.cars)]
+
+    for cls in (DictCar, Car):
+        memory = bench_memory(cls, names, prices)
+        print(f"{cls.__name__:<8} память: {memory['bytes_per_car']:.0f} байт на машину ({args.cars} машин)")
+
+    builds = {
+        "Car(...)": lambda names, prices: [Car(name, price) for name, price in zip(names, prices)],
+        "from_columns": Car.from_columns,
+    }
+    for label, build in builds.items():
+        print(f"{label:<14} {bench_build(build, names, prices):.3f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import unittest
 import sys
 import subprocess
+import copy
+import pickle
+import weakref
 
-from autosalon import StringValue, PriceValue, AutoSalon, Car
+from autosalon import StringValue, PriceValue, AutoSalon, Car, Inventory
 
 class TestStringValue(unittest.TestCase):
     def test_valid_string(self):
@@ -90,6 +93,42 @@ class TestCar(unittest.TestCase):
         car.price = -500  # отрицательная цена
         self.assertEqual(car.price, 3000)  # значение не должно измениться
 
+    def test_car_has_no_dict(self):
+        car = Car("Lada", 3000)
+        self.assertFalse(hasattr(car, "__dict__"))
+        car.name = 12345  # слоты не меняют молчаливого отказа
+        self.assertEqual(car.name, "Lada")
+        self.assertIsNone(Car("A", -1).price)
+
+    def test_descriptors_in_slotted_class(self):
+        class TestClass:
+            __slots__ = ("_name",)
+            name = StringValue(2, 50)
+
+        obj = TestClass()
+        self.assertIsNone(obj.name)
+        obj.name = "OK"
+        obj.name = "A"
+        self.assertEqual(obj.name, "OK")
+
+    def test_from_records_matches_constructor(self):
+        records = [("Lada", 3000), ("A", 5000), ("Nissan", -1), (12345, 2_000_000), ("Toyota", 9000.5)]
+        cars = Car.from_records(records)
+        expected = [Car(name, price) for name, price in records]
+        self.assertEqual([(car.name, car.price) for car in cars], [(car.name, car.price) for car in expected])
+        self.assertTrue(all(type(car) is Car for car in cars))
+        self.assertTrue(all(car._observers is None for car in cars))  # Слот задан, как в __init__
+
+        cars[0].price = -500  # дескриптор по-прежнему отклоняет неверные значения
+        self.assertEqual(cars[0].price, 3000)
+
+    def test_from_records_rejects_bad_shape(self):
+        self.assertEqual(Car.from_records([]), [])
+        with self.assertRaises(ValueError):
+            Car.from_records([("Lada", 3000, "extra")])
+        with self.assertRaises(ValueError):
+            Car.from_columns(["Lada", "Nissan"], [3000])
+
 class TestAutoSalon(unittest.TestCase):
     def test_autosalon_creation(self):
         salon = AutoSalon("AutoWorld")
@@ -118,5 +157,123 @@ class TestAutoSalon(unittest.TestCase):
         self.assertIn(car1, salon.cars)
         self.assertNotIn(car2, salon.cars)
 
+    def test_salons_do_not_share_cars(self):
+        first = AutoSalon("AutoWorld")
+        second = AutoSalon("CarLand")
+        car = Car("Nissan", 8000)
+        first.add_car(car)
+        self.assertEqual(second.cars, [])
+        second.add_car(car)
+        first.remove_car(car)
+        self.assertEqual(first.cars, [])
+        self.assertEqual(second.cars, [car])
+
+    def test_cars_is_list_compatible(self):
+        salon = AutoSalon("AutoWorld")
+        cars = [Car("Nissan", 8000), Car("Toyota", 9000)]
+        salon.add_car(cars[0])
+        salon.cars.append(cars[1])  # Как у списка из README: в конец
+        self.assertEqual(salon.cars, cars)
+        self.assertEqual(salon.cars[-1], cars[-1])
+        self.assertEqual(salon.cars[:1], cars[:1])
+        self.assertEqual(salon.cars.index(cars[1]), 1)
+        self.assertEqual(salon.inventory.by_name("Toyota"), [cars[1]])
+
+        lada = Car("Lada", 3000)
+        salon.cars.extend([lada])
+        salon.cars.remove(lada)
+        with self.assertRaises(ValueError):
+            salon.cars.remove(lada)
+        with self.assertRaises(TypeError):
+            salon.cars[0] = lada  # Порядок задается только добавлением
+        self.assertEqual(salon.cars, cars)
+
+        for car in salon.cars:  # Удаление в цикле не ломает обход
+            salon.remove_car(car)
+        self.assertEqual(salon.cars, [])
+
+    def test_duplicate_car_is_rejected(self):
+        salon = AutoSalon("AutoWorld")
+        car = Car("Nissan", 8000)
+        salon.add_car(car)
+        with self.assertRaises(ValueError):
+            salon.add_car(car)
+        with self.assertRaises(ValueError):
+            salon.cars.append(car)
+        self.assertEqual(salon.cars, [car])
+
+    def test_indexing_reuses_snapshot(self):
+        salon = AutoSalon("AutoWorld")
+        for car in Car.from_records([("Lada", price) for price in range(100)]):
+            salon.add_car(car)
+        snapshot = salon.inventory.snapshot()
+        self.assertEqual([salon.cars[index].price for index in range(len(salon.cars))], list(range(100)))
+        self.assertIs(salon.inventory.snapshot(), snapshot)  # Обращения по номеру не копируют машины
+
+        salon.remove_car(snapshot[0])
+        self.assertEqual(salon.cars[0].price, 1)
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.lada = Car("Lada", 3000)
+        self.niva = Car("Niva", 5000)
+        self.kia = Car("Kia", 4000)
+        self.other_lada = Car("Lada", 7000)
+        self.inventory = Inventory([self.lada, self.niva, self.kia, self.other_lada])
+
+    def test_indexes(self):
+        self.assertEqual(len(self.inventory), 4)
+        self.assertEqual(self.inventory.by_name("Lada"), [self.lada, self.other_lada])
+        self.assertEqual(self.inventory.by_name("Volga"), [])
+        self.assertEqual(self.inventory.by_price(3000, 5000), [self.lada, self.kia, self.niva])
+        self.assertEqual(self.inventory.by_price(5001, 6999), [])
+
+    def test_remove_by_identity(self):
+        twin = Car("Lada", 3000)
+        self.inventory.discard(twin)  # такая же, но другая машина
+        self.assertEqual(len(self.inventory), 4)
+        self.inventory.remove(self.lada)
+        self.assertNotIn(self.lada, self.inventory)
+        self.assertEqual(self.inventory.by_name("Lada"), [self.other_lada])
+        self.assertEqual(self.inventory.by_price(0, 4000), [self.kia])
+        with self.assertRaises(KeyError):
+            self.inventory.remove(self.lada)
+
+    def test_reassignment_updates_indexes(self):
+        self.kia.price = 8000
+        self.kia.name = "Lada"
+        self.niva.price = -1  # отклоняется, индекс не меняется
+        self.assertEqual(self.inventory.by_price(0, 10000), [self.lada, self.niva, self.other_lada, self.kia])
+        self.assertEqual(self.inventory.by_name("Lada"), [self.lada, self.other_lada, self.kia])
+        self.assertEqual(self.inventory.by_name("Kia"), [])
+
+        self.inventory.remove(self.kia)
+        self.kia.price = 100  # после удаления машина больше не влияет на индексы
+        self.assertEqual(self.inventory.by_price(0, 1000), [])
+
+    def test_copy_is_outside_inventory(self):
+        for duplicate in (copy.copy(self.kia), copy.deepcopy(self.kia), pickle.loads(pickle.dumps(self.kia))):
+            self.assertEqual((duplicate.name, duplicate.price), ("Kia", 4000))
+            self.assertNotIn(duplicate, self.inventory)
+            duplicate.price = 100
+            duplicate.name = "Volga"
+        self.assertEqual(self.inventory.by_price(0, 1000), [])
+        self.assertEqual(self.inventory.by_name("Volga"), [])
+        self.assertEqual(self.inventory.by_name("Kia"), [self.kia])
+
+    def test_foreign_car_change_is_ignored(self):
+        stranger = Car("Volga", 100)
+        self.inventory.field_changed(stranger, "price", 100, 200)
+        self.inventory.field_changed(stranger, "name", "Volga", "Lada")
+        self.assertEqual(self.inventory.by_name("Lada"), [self.lada, self.other_lada])
+        self.assertEqual(len(self.inventory.by_price(0, 10000)), 4)
+
+    def test_car_does_not_keep_inventory_alive(self):
+        reference = weakref.ref(self.inventory)
+        del self.inventory
+        self.assertIsNone(reference())  # Без сборщика: машины держат только слабые ссылки
+        self.lada.price = 100
+        self.assertIsNone(self.lada._observers)  # Мертвая ссылка выброшена
+
 if __name__ == '__main__':
     unittest.main()
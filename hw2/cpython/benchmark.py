@@ -0,0 +1,279 @@
+import cProfile
+import dataclasses
+import json
+import os
+import pstats
+import shutil
+import statistics
+import sys
+import sysconfig
+import time
+
+from argparse import ArgumentParser, Namespace
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from pathlib import Path
+from tempfile import mkdtemp
+from unittest import mock
+
+import cpython
+
+
+STAGES = ("checks", "cleanup", "discovery", "copy", "build_file")
+
+HEADER_SUBDIRECTORIES = ("", "cpython", "internal")
+
+
+@dataclasses.dataclass
+class FakeInstallation:
+    """Синтетическая установка `CPython` с раскладкой как у `sysconfig`."""
+
+    root: Path
+    include: Path
+    libdir: Path
+
+    def get_path(self, name: str, *args, **kwargs) -> str:
+        """Подменить `sysconfig.get_path`."""
+        if name == "data":
+            return self.root.as_posix()
+
+        if name == "include":
+            return self.include.as_posix()
+
+        return _original_get_path(name, *args, **kwargs)
+
+    def get_config_var(self, name: str) -> str | None:
+        """Подменить `sysconfig.get_config_var`."""
+        if name == "LIBDIR":
+            return self.libdir.as_posix()
+
+        return _original_get_config_var(name)
+
+
+_original_get_path = sysconfig.get_path
+_original_get_config_var = sysconfig.get_config_var
+
+
+def get_parser() -> ArgumentParser:
+    """Получить парсер аргументов командной строки."""
+    parser = ArgumentParser(
+        prog="benchmark",
+        description="Замерить время этапов `cpython.main()` на синтетической установке CPython.",
+    )
+    parser.add_argument("--headers", type=int, default=2000, help="число заголовочных файлов")
+    parser.add_argument("--libdir-files", type=int, default=5000, help="число файлов в LIBDIR")
+    parser.add_argument("--header-size", type=int, default=4096, help="размер заголовка в байтах")
+    parser.add_argument("--library-size", type=int, default=1 << 20, help="размер .so в байтах")
+    parser.add_argument("--repeat", type=int, default=5, help="число прогонов конвейера")
+    parser.add_argument("--json", type=Path, default=None, help="файл для JSON-отчета")
+    parser.add_argument("--profile", action="store_true", help="вывести профиль cProfile")
+    return parser
+
+
+def get_library_names() -> tuple[str, str | None]:
+    """Получить имена разделяемой библиотеки и библиотеки-интерфейса для текущей платформы."""
+    major, minor = sys.version_info[:2]
+
+    if cpython.is_windows():
+        return f"python{major}{minor}.dll", f"python{major}{minor}.lib"
+
+    if cpython.is_macos():
+        return f"libpython{major}.{minor}.dylib", None
+
+    return f"libpython{major}.{minor}.so", None
+
+
+def build_fake_installation(
+    base: Path,
+    headers: int,
+    libdir_files: int,
+    header_size: int,
+    library_size: int,
+) -> FakeInstallation:
+    """Создать синтетическую установку с множеством заголовков и большим `LIBDIR`."""
+    major, minor = sys.version_info[:2]
+
+    root = base / "python"
+    include = root / "include" / f"python{major}.{minor}"
+    libdir = root if cpython.is_windows() else root / "lib"
+
+    header_body = b"/* synthetic */\n".ljust(header_size, b" ")
+    for index in range(headers):
+        subdirectory = include / HEADER_SUBDIRECTORIES[index % len(HEADER_SUBDIRECTORIES)]
+        subdirectory.mkdir(parents=True, exist_ok=True)
+        subdirectory.joinpath(f"header_{index:06}.h").write_bytes(header_body)
+
+    for index in range(libdir_files):
+        subdirectory = libdir / "site-packages" / f"package_{index % 100:03}"
+        subdirectory.mkdir(parents=True, exist_ok=True)
+        subdirectory.joinpath(f"module_{index:06}.py").touch()
+
+    shared_name, interface_name = get_library_names()
+    shared_directory = libdir / "config"
+    shared_directory.mkdir(parents=True, exist_ok=True)
+    shared_directory.joinpath(shared_name).write_bytes(bytes(library_size))
+
+    if interface_name is not None:
+        interface_directory = root / "libs"
+        interface_directory.mkdir(parents=True, exist_ok=True)
+        interface_directory.joinpath(interface_name).write_bytes(bytes(library_size // 16))
+
+    return FakeInstallation(root=root, include=include, libdir=libdir)
+
+
+@contextmanager
+def patched_sysconfig(installation: FakeInstallation) -> Generator[None, None, None]:
+    """Направить `sysconfig` на синтетическую установку."""
+    with (
+        mock.patch.object(sysconfig, "get_path", installation.get_path),
+        mock.patch.object(sysconfig, "get_config_var", installation.get_config_var),
+    ):
+        yield
+
+
+@contextmanager
+def cd(path: Path) -> Generator[None, None, None]:
+    """Сменить рабочий каталог."""
+    cwd = Path.cwd()
+    os.chdir(path)
+
+    try:
+        yield
+
+    finally:
+        os.chdir(cwd)
+
+
+def run_pipeline(profiler: cProfile.Profile | None = None) -> dict[str, float]:
+    """Выполнить этапы `cpython.main()` по отдельности и вернуть их длительности в секундах.
+
+    С `profiler` этапы выполняются под cProfile, и длительности включают его накладные расходы.
+    """
+    timings: dict[str, float] = {}
+    state: dict[str, object] = {}
+
+    def timed(stage: str, function: Callable[[], object]) -> None:
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            start = time.perf_counter()
+            state[stage] = function()
+            timings[stage] = time.perf_counter() - start
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+    build_directory = cpython.get_build_directory()
+
+    timed("checks", cpython.check_system)
+    timed("cleanup", lambda: cpython.clean_build_directory(build_directory))
+    timed("discovery", cpython.discover_files)
+
+    files = state["discovery"]
+    if not isinstance(files, cpython.DiscoveredFiles):
+        detail = f"discover_files вернула {type(files).__name__}, а не DiscoveredFiles"
+        raise TypeError(detail)
+
+    timed("copy", lambda: cpython.copy_files(files, build_directory))
+    timed("build_file", lambda: cpython.stage_build_file(files, build_directory))
+
+    return timings
+
+
+def summarize(runs: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Свести прогоны в минимум, медиану и максимум по каждому этапу."""
+    summary = {}
+
+    for stage in (*STAGES, "total"):
+        if stage == "total":
+            values = [sum(run.values()) for run in runs]
+        else:
+            values = [run[stage] for run in runs]
+
+        summary[stage] = {
+            "min": min(values),
+            "median": statistics.median(values),
+            "max": max(values),
+        }
+
+    return summary
+
+
+def format_report(summary: dict[str, dict[str, float]]) -> str:
+    """Отформатировать сводку в виде таблицы."""
+    total = summary["total"]["median"]
+    lines = [f"{'stage':<12}{'min, ms':>12}{'median, ms':>12}{'max, ms':>12}{'share':>8}"]
+
+    for stage, values in summary.items():
+        share = values["median"] / total if total else 0.0
+        lines.append(
+            f"{stage:<12}"
+            f"{values['min'] * 1000:>12.2f}"
+            f"{values['median'] * 1000:>12.2f}"
+            f"{values['max'] * 1000:>12.2f}"
+            f"{share:>8.1%}"
+        )
+
+    return "\n".join(lines)
+
+
+def benchmark(args: Namespace) -> dict[str, object]:
+    """Построить установку, прогнать конвейер и вернуть отчет."""
+    base = Path(mkdtemp(prefix="cpython-benchmark-"))
+    profiler = cProfile.Profile() if args.profile else None
+
+    try:
+        installation = build_fake_installation(
+            base,
+            headers=args.headers,
+            libdir_files=args.libdir_files,
+            header_size=args.header_size,
+            library_size=args.library_size,
+        )
+        workspace = base / "workspace"
+        workspace.mkdir()
+
+        with patched_sysconfig(installation), cd(workspace):
+            runs = [run_pipeline() for _ in range(args.repeat)]
+            if profiler is not None:
+                # Профиль снимается отдельным прогоном, чтобы накладные расходы cProfile не попали в замеры
+                run_pipeline(profiler)
+
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+    if profiler is not None:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+
+    return {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "parameters": {
+            "headers": args.headers,
+            "libdir_files": args.libdir_files,
+            "header_size": args.header_size,
+            "library_size": args.library_size,
+            "repeat": args.repeat,
+        },
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Запустить замер."""
+    args = get_parser().parse_args(argv)
+    if args.repeat < 1:
+        detail = "Число прогонов должно быть положительным"
+        raise AssertionError(detail)
+
+    report = benchmark(args)
+    print(format_report(report["summary"]))  # type: ignore[arg-type]
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,329 @@
+import dataclasses
+import os
+import platform
+import shutil
+import sys
+import sysconfig
+
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import BinaryIO
+
+
+MINIMAL_PYTHON_VERSION = (3, 8, 0)
+
+THIRD_PARTY_DIRECTORY = Path("third_party") / "cpython"
+INTERNAL_DIRECTORY_NAME = "internal"
+BUILD_FILE_NAME = "BUILD.bazel"
+
+CHUNK_SIZE = 64 * 1024
 
 
 def is_cpython() -> bool:
     """Проверить, что используется `CPython`."""
+    return platform.python_implementation() == "CPython"
 
 
 def is_linux() -> bool:
     """Проверить, что используется `Linux`."""
+    return sys.platform.startswith("linux")
 
 
 def is_windows() -> bool:
     """Проверить, что используется `Windows`."""
+    return sys.platform == "win32"
 
 
 def is_macos() -> bool:
     """Проверить, что используется `is_macOS`."""
+    return sys.platform == "darwin"
 
 
 def is_supported_platform() -> bool:
     """Проверить, что платформа поддерживается."""
+    return is_linux() or is_windows() or is_macos()
 
 
 def is_supported_python_version() -> bool:
     """Проверить, что версия `Python` поддерживается."""
+    return sys.version_info[:3] >= MINIMAL_PYTHON_VERSION
 
 
 def get_cpython_root() -> Path:
     """Получить путь до корня `CPython`."""
+    return Path(sysconfig.get_path("data"))
+
+
+def get_include_directory() -> Path:
+    """Получить директорию поиска заголовочных файлов."""
+    return Path(sysconfig.get_path("include"))
+
+
+def get_library_directory() -> Path:
+    """Получить директорию поиска разделяемой библиотеки."""
+    if is_windows():
+        return get_cpython_root()
+
+    return Path(sysconfig.get_config_var("LIBDIR"))
+
+
+def get_build_directory() -> Path:
+    """Получить директорию сборки `third_party/cpython`."""
+    return Path.cwd() / THIRD_PARTY_DIRECTORY
+
+
+def find_single_file(directory: Path, name: str) -> Path:
+    """Найти файл с заданным именем, возможно вложенный в другие директории."""
+    try:
+        return next(directory.rglob(name))
+
+    except StopIteration:
+        detail = f"Файл '{name}' не найден в '{directory}'"
+        raise AssertionError(detail)
 
 
 def get_interface_library() -> Path | None:
     """Получить путь до библиотеки-интерфейса, если она требуется."""
+    if not is_windows():
+        return None
+
+    major, minor = sys.version_info[:2]
+    return find_single_file(get_cpython_root() / "libs", f"python{major}{minor}.lib")
 
 
 def get_shared_library() -> Path:
     """Получить путь до разделяемой библиотеки."""
+    major, minor = sys.version_info[:2]
+
+    if is_windows():
+        name = f"python{major}{minor}.dll"
+    elif is_macos():
+        name = f"libpython{major}.{minor}.dylib"
+    else:
+        name = f"libpython{major}.{minor}.so"
+
+    return find_single_file(get_library_directory(), name)
 
 
 def get_header_files() -> list[Path]:
     """Получить список загловочных файлов."""
+    return sorted(set(get_include_directory().rglob("*.h")))
+
+
+def get_internal_path(path: Path, search_directory: Path) -> Path:
+    """Получить путь скопированного файла относительно `third_party/cpython`."""
+    return INTERNAL_DIRECTORY_NAME / path.relative_to(search_directory)
+
+
+@dataclasses.dataclass
+class DiscoveredFiles:
+    """Найденные файлы `CPython` вместе с директориями, в которых они искались."""
+
+    include_directory: Path
+    headers: list[Path]
+    library_directory: Path
+    shared_library: Path
+    cpython_root: Path
+    interface_library: Path | None
+
+    def iter_copies(self) -> Iterator[tuple[Path, Path]]:
+        """Перечислить пары (файл, директория поиска) для копирования."""
+        for header in self.headers:
+            yield header, self.include_directory
+
+        if self.interface_library is not None:
+            yield self.interface_library, self.cpython_root
+
+        yield self.shared_library, self.library_directory
+
+
+def discover_files() -> DiscoveredFiles:
+    """Найти все файлы, необходимые для сборки."""
+    return DiscoveredFiles(
+        include_directory=get_include_directory(),
+        headers=get_header_files(),
+        library_directory=get_library_directory(),
+        shared_library=get_shared_library(),
+        cpython_root=get_cpython_root(),
+        interface_library=get_interface_library(),
+    )
+
+
+def get_build_labels(files: DiscoveredFiles | None = None) -> tuple[list[str], str | None, str]:
+    """Получить пути `hdrs`, `interface_library` и `shared_library` для `BUILD.bazel`."""
+    if files is None:
+        files = discover_files()
+
+    headers = [
+        get_internal_path(header, files.include_directory).as_posix() for header in files.headers
+    ]
+
+    interface_label = None
+    if files.interface_library is not None:
+        interface_label = get_internal_path(files.interface_library, files.cpython_root).as_posix()
+
+    shared_label = get_internal_path(files.shared_library, files.library_directory).as_posix()
+
+    return headers, interface_label, shared_label
+
+
+def iter_build_file_lines(
+    headers: Iterable[str],
+    interface_library: str | None,
+    shared_library: str,
+) -> Iterator[str]:
+    """Построчно сгенерировать содержимое `BUILD.bazel`.
+
+    Заголовочные файлы выводятся отсортированными и без повторов, чтобы при одинаковом
+    наборе файлов содержимое совпадало байт в байт.
+    """
+    yield "cc_import(\n"
+    yield '    name = "cpython",\n'
+    yield "    hdrs = [\n"
+
+    for header in sorted(set(headers)):
+        yield f'        "{header}",\n'
+
+    yield "    ],\n"
+    yield f'    includes = ["{INTERNAL_DIRECTORY_NAME}"],\n'
+
+    if interface_library is not None:
+        yield f'    interface_library = "{interface_library}",\n'
+
+    yield f'    shared_library = "{shared_library}",\n'
+    yield '    visibility = ["//visibility:public"],\n'
+    yield ")\n"
 
 
 def get_build_file_contents() -> str:
     """Получить содержимое файла `BUILD.bazel`"""
+    return "".join(iter_build_file_lines(*get_build_labels()))
+
+
+def find_first_difference(path: Path, lines: Iterator[bytes]) -> tuple[int, bytes | None]:
+    """Потоково сравнить файл с ожидаемым содержимым.
+
+    Возвращает длину совпавшего префикса и первую несовпавшую строку. Если содержимое
+    совпадает полностью, вместо строки возвращается `None`.
+    """
+    matched = 0
+
+    try:
+        file = path.open("rb")
+
+    except FileNotFoundError:
+        return matched, next(lines, b"")
+
+    with file:
+        for line in lines:
+            if file.read(len(line)) != line:
+                return matched, line
+
+            matched += len(line)
+
+        if file.read(1) != b"":
+            return matched, b""
+
+    return matched, None
+
+
+def copy_prefix(source: Path, destination: BinaryIO, size: int) -> None:
+    """Скопировать первые `size` байт файла."""
+    if size == 0:
+        return
+
+    with source.open("rb") as file:
+        while size > 0:
+            chunk = file.read(min(size, CHUNK_SIZE))
+            destination.write(chunk)
+            size -= len(chunk)
+
+
+def write_build_file(path: Path, lines: Iterable[str]) -> bool:
+    """Записать `BUILD.bazel`, если его содержимое изменилось.
+
+    Строки сравниваются с существующим файлом по мере генерации. При первом расхождении
+    совпавший префикс, расходящаяся строка и остаток генератора пишутся во временный файл,
+    который затем атомарно подменяет старый. Неизмененный файл не трогается.
+    Возвращает `True`, если файл был перезаписан.
+    """
+    encoded = (line.encode() for line in lines)
+    matched, pending = find_first_difference(path, encoded)
+    if pending is None:
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+
+    with temporary.open("wb") as file:
+        copy_prefix(path, file, matched)
+        file.write(pending)
+        file.writelines(encoded)
+
+    os.replace(temporary, path)
+    return True
+
+
+def check_system() -> None:
+    """Проверить систему на ограничения."""
+    if not is_cpython():
+        detail = "The Python implementation is not CPython"
+        raise AssertionError(detail)
+
+    if not is_supported_python_version():
+        version = ".".join(map(str, MINIMAL_PYTHON_VERSION))
+        detail = f"The Python version is older than {version}"
+        raise AssertionError(detail)
+
+    if not is_supported_platform():
+        detail = "The platform is not supported (expected Linux, Windows or macOS)"
+        raise AssertionError(detail)
+
+
+def clean_build_directory(build_directory: Path) -> None:
+    """Удалить файлы предыдущих запусков, оставив `BUILD.bazel` для сравнения."""
+    if not build_directory.is_dir():
+        return
+
+    for path in build_directory.iterdir():
+        if path.name == BUILD_FILE_NAME:
+            continue
+
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            path.unlink(missing_ok=True)
+
+
+def copy_file(path: Path, search_directory: Path, build_directory: Path) -> None:
+    """Скопировать файл в директорию сборки, сохранив путь относительно директории поиска."""
+    destination = build_directory / get_internal_path(path, search_directory)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(path, destination)
+
+
+def copy_files(files: DiscoveredFiles, build_directory: Path) -> None:
+    """Скопировать найденные файлы в директорию сборки."""
+    for path, search_directory in files.iter_copies():
+        copy_file(path, search_directory, build_directory)
+
+
+def stage_build_file(files: DiscoveredFiles, build_directory: Path) -> bool:
+    """Записать `BUILD.bazel` для скопированных файлов."""
+    lines = iter_build_file_lines(*get_build_labels(files))
+    return write_build_file(build_directory / BUILD_FILE_NAME, lines)
 
 
 def main() -> None:
     """Запустить скрипт."""
+    check_system()
+
+    build_directory = get_build_directory()
+    clean_build_directory(build_directory)
+
+    files = discover_files()
+    copy_files(files, build_directory)
+    stage_build_file(files, build_directory)
 
 
 if __name__ == "__main__":
@@ -114,3 +114,17 @@ def test__build_file(cpython_directory: Path) -> None:
     if not all(cpython_directory.joinpath(header).exists() for header in headers):
         detail = "Некоторые файлы из `hdrs` не существуют"
         raise AssertionError(detail)
+
+
+def test__build_file__unchanged_is_not_rewritten(cpython_directory: Path) -> None:
+    """Кейс: повторный запуск не трогает неизмененный файл сборки."""
+    main()
+
+    build_file = cpython_directory / "BUILD.bazel"
+    contents = build_file.read_bytes()
+    modified_at = build_file.stat().st_mtime_ns
+
+    main()
+
+    assert build_file.read_bytes() == contents, "Содержимое `BUILD.bazel` должно быть стабильным"
+    assert build_file.stat().st_mtime_ns == modified_at, "Неизмененный `BUILD.bazel` перезаписан"
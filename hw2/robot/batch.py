@@ -0,0 +1,135 @@
+from array import array
+from collections.abc import Iterable
+from operator import add
+
+from events import PRINT_SINK
+from robot_vacuum_cleaner import (
+    DX,
+    DY,
+    HEADING_INDEX,
+    HEADINGS,
+    MOVEMENT_SIGN,
+    Direction,
+    Movement,
+    RemoteControlCar,
+    TurnDirection,
+)
+
+
+# Таблицы для `bytes.translate`: номер направления -> номер после поворота
+TURN_TABLES = {
+    turn_direction: bytes(
+        (heading + turn_direction.value) % len(HEADINGS) if heading < len(HEADINGS) else heading
+        for heading in range(256)
+    )
+    for turn_direction in TurnDirection
+}
+
+
+class RobotBatch:
+    """Положения и направления многих роботов в параллельных массивах.
+
+    Координаты лежат в `xs`/`ys` (`array('q')`), направления — номерами из
+    `HEADINGS` в `headings` (`bytearray`). Команды `move` и `turn` применяются
+    сразу ко всем роботам (или к перечисленным индексам): смещение берется из
+    таблиц `DX`/`DY` по номеру направления, поворот делается `bytes.translate`.
+    Массивы меняются на месте, так что ссылки на них остаются действительными.
+    """
+
+    def __init__(self, count: int = 0) -> None:
+        self.xs = array("q", bytes(8 * count))
+        self.ys = array("q", bytes(8 * count))
+        self.headings = bytearray(count)
+
+    def __len__(self) -> int:
+        return len(self.headings)
+
+    def add(self, position: Iterable[int] = (0, 0), direction: Direction = Direction.NORTH) -> int:
+        """Добавить робота и вернуть его индекс"""
+        x, y = position
+        self.xs.append(x)
+        self.ys.append(y)
+        self.headings.append(HEADING_INDEX[direction])
+        return len(self.headings) - 1
+
+    def move(self, distance: int, movement: Movement, indices: Iterable[int] | None = None) -> None:
+        """Сдвинуть роботов на `distance` единиц вперед или назад"""
+        step = distance * MOVEMENT_SIGN[movement]
+        dxs = [dx * step for dx in DX]
+        dys = [dy * step for dy in DY]
+
+        if indices is None:
+            self.xs[:] = array("q", map(add, self.xs, map(dxs.__getitem__, self.headings)))
+            self.ys[:] = array("q", map(add, self.ys, map(dys.__getitem__, self.headings)))
+            return
+
+        xs, ys, headings = self.xs, self.ys, self.headings
+        for index in indices:
+            heading = headings[index]
+            xs[index] += dxs[heading]
+            ys[index] += dys[heading]
+
+    def turn(self, turn_direction: TurnDirection, indices: Iterable[int] | None = None) -> None:
+        """Повернуть роботов налево или направо"""
+        table = TURN_TABLES[turn_direction]
+
+        if indices is None:
+            self.headings[:] = self.headings.translate(table)
+            return
+
+        headings = self.headings
+        for index in indices:
+            headings[index] = table[headings[index]]
+
+    def positions(self) -> list[list[int]]:
+        return [[x, y] for x, y in zip(self.xs, self.ys)]
+
+    def directions(self) -> list[Direction]:
+        return [HEADINGS[heading] for heading in self.headings]
+
+    def robot(self, index: int) -> "RobotView":
+        """Один робот пачки с интерфейсом `RemoteControlCar`"""
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Нет робота с индексом {index}")
+        return RobotView(self, index % len(self))
+
+
+class RobotView(RemoteControlCar):
+    """Робот, чье состояние хранится в `RobotBatch`.
+
+    Поля `x`, `y` и `heading` читаются и пишутся прямо в массивы пачки, поэтому
+    `position` и `direction` ведут себя так же, как у `RemoteControlCar`.
+    """
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: RobotBatch, index: int) -> None:
+        # `RobotState.__init__` не вызывается: он обнулил бы координаты в массивах пачки
+        self.robot_id = index
+        self.sink = PRINT_SINK
+        self.batch = batch
+        self.index = index
+
+    @property
+    def x(self) -> int:
+        return self.batch.xs[self.index]
+
+    @x.setter
+    def x(self, x: int) -> None:
+        self.batch.xs[self.index] = x
+
+    @property
+    def y(self) -> int:
+        return self.batch.ys[self.index]
+
+    @y.setter
+    def y(self, y: int) -> None:
+        self.batch.ys[self.index] = y
+
+    @property
+    def heading(self) -> int:
+        return self.batch.headings[self.index]
+
+    @heading.setter
+    def heading(self, heading: int) -> None:
+        self.batch.headings[self.index] = heading
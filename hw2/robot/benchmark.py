@@ -0,0 +1,276 @@
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+from batch import RobotBatch
+from events import EventSink, NullSink, PrintSink, RingBufferSink
+from robot_vacuum_cleaner import AutonomousCleaningRobot, Movement, SensorDirection, TurnDirection
+from scheduler import TickScheduler, random_robots
+from world import World
+
+
+BATCH = 1000
+
+NULL_SINK = NullSink()
+
+Results = dict[str, dict[str, dict[str, float]]]
+
+
+def get_parser() -> ArgumentParser:
+    """Получить парсер аргументов командной строки."""
+    parser = ArgumentParser(prog="benchmark", description="Замеры памяти и скорости роботов-пылесосов.")
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS),
+        help="какие операции замерять",
+    )
+    parser.add_argument(
+        "--sinks",
+        nargs="+",
+        choices=list(SINKS),
+        default=["null", "ring", "print"],
+        help="куда идут события в замерах одного робота (stdout печатает в терминал)",
+    )
+    parser.add_argument("--robots", type=int, default=10000, help="число роботов-объектов в замерах тактов")
+    parser.add_argument("--batch-robots", type=int, default=10**6, help="число роботов пачки в замерах тактов пачки")
+    parser.add_argument("--memory-robots", type=int, default=10**6, help="число роботов в замере памяти; 0 — не мерить")
+    parser.add_argument("--duration", type=float, default=1.0, help="секунд на один замер")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора")
+    parser.add_argument("--json", type=Path, default=None, help="файл для JSON-отчета")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON-отчет прошлого запуска для сравнения")
+    return parser
+
+
+def measure(
+    function: Callable[..., object],
+    duration: float,
+    setup: Callable[[], object] | None = None,
+) -> dict[str, float]:
+    """Вызывать функцию, пока не пройдет `duration` секунд; вернуть число вызовов в секунду.
+
+    Если задана `setup`, ее результат передается в функцию перед каждым вызовом,
+    а время подготовки в замер не входит.
+    """
+    calls = 0
+    elapsed = 0.0
+
+    while elapsed < duration or calls == 0:
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        function(*arguments)
+        elapsed += time.perf_counter() - start
+        calls += 1
+
+    return {"calls": calls, "seconds": elapsed, "per_second": calls / elapsed}
+
+
+def with_operations(result: dict[str, float], operations: int) -> dict[str, float]:
+    """Добавить к замеру число операций за вызов и операций в секунду."""
+    result["operations"] = operations
+    result["ops_per_second"] = result["per_second"] * operations
+    return result
+
+
+def compare(results: Results, baseline: Results) -> dict[str, dict[str, float]]:
+    """Во сколько раз текущие операции в секунду больше, чем в базовом отчете.
+
+    Отчеты устроены как `{операция: {вариант: замер}}`; вариант — приемник событий
+    или число роботов.
+    """
+    ratios: dict[str, dict[str, float]] = {}
+    for operation, by_variant in results.items():
+        for variant, result in by_variant.items():
+            base = baseline.get(operation, {}).get(variant)
+            if base:
+                ratios.setdefault(operation, {})[variant] = result["ops_per_second"] / base["ops_per_second"]
+    return ratios
+
+
+SINKS: dict[str, Callable[[], EventSink]] = {
+    "null": NullSink,
+    "ring": RingBufferSink,
+    "print": PrintSink,
+    "stdout": PrintSink,
+}
+
+
+def make_sink(name: str, devnull: IO[str]) -> EventSink:
+    """Приемник из `SINKS`; `print` печатает в `devnull`: форматирование и запись остаются, терминала нет"""
+    if name == "print":
+        return PrintSink(devnull)
+    return SINKS[name]()
+
+
+def make_robots(count: int) -> list[AutonomousCleaningRobot]:
+    """Роботы без вывода"""
+    return [AutonomousCleaningRobot(robot_id=number, sink=NULL_SINK) for number in range(count)]
+
+
+def bench_memory(count: int) -> dict[str, float]:
+    """Память, которую занимают `count` роботов вместе со списком."""
+    gc.collect()
+    tracemalloc.start()
+    robots = make_robots(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del robots
+    return {"robots": count, "bytes": size, "bytes_per_robot": size / count}
+
+
+def bench_batch_memory(count: int) -> dict[str, float]:
+    """Память, которую занимает `RobotBatch` из `count` роботов."""
+    gc.collect()
+    tracemalloc.start()
+    batch = RobotBatch(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del batch
+    return {"robots": count, "bytes": size, "bytes_per_robot": size / count}
+
+
+def single_robot(operation: Callable[[AutonomousCleaningRobot], object]) -> Callable[..., dict[str, float]]:
+    """Замер метода одного робота: `BATCH` вызовов подряд с событиями в заданный приемник."""
+
+    def bench(sink: EventSink, robots: int, duration: float, rng: random.Random) -> dict[str, float]:
+        robot = AutonomousCleaningRobot(sink=sink)
+        # Препятствие впереди и справа: `auto_move` каждый раз поворачивает налево
+        robot.sensors[SensorDirection.FRONT] = True
+        robot.sensors[SensorDirection.RIGHT] = True
+
+        def run() -> None:
+            for _ in range(BATCH):
+                operation(robot)
+
+        return with_operations(measure(run, duration), BATCH)
+
+    return bench
+
+
+def bench_tick_objects(sink: EventSink, robots: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """Такт из `clean_and_move` для каждого робота-объекта в общей комнате."""
+    world = World(int(robots ** 0.5) * 2, int(robots ** 0.5) * 2)
+    fleet = random_robots(world, robots, rng)
+    for robot in fleet:
+        robot.sink = sink
+
+    def tick() -> None:
+        for robot in fleet:
+            robot.clean_and_move()
+
+    return with_operations(measure(tick, duration), robots)
+
+
+def bench_tick_batch(sink: EventSink, robots: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """Такт `RobotBatch`: поворот и шаг вперед сразу для всех роботов."""
+    batch = RobotBatch(robots)
+
+    def tick() -> None:
+        batch.turn(TurnDirection.RIGHT)
+        batch.move(1, Movement.FORWARD)
+
+    return with_operations(measure(tick, duration), robots)
+
+
+def bench_tick_views(sink: EventSink, robots: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """Такт через `RobotView`: поворот и шаг каждого робота пачки по отдельности."""
+    batch = RobotBatch(robots)
+    views = [batch.robot(index) for index in range(robots)]
+    for view in views:
+        view.sink = sink
+
+    def tick() -> None:
+        for view in views:
+            view.turn(TurnDirection.RIGHT)
+            view.move(1, Movement.FORWARD)
+
+    return with_operations(measure(tick, duration), robots)
+
+
+def bench_tick_scheduler(sink: EventSink, robots: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """Такт `TickScheduler` в одном процессе с проверкой столкновений."""
+    world = World(int(robots ** 0.5) * 2, int(robots ** 0.5) * 2)
+    with TickScheduler(world, random_robots(world, robots, rng), workers=1) as scheduler:
+        return with_operations(measure(scheduler.tick, duration), robots)
+
+
+# Замеры одного робота зависят от приемника событий, замеры тактов — от числа роботов:
+# такты пачки идут на `--batch-robots` роботах, остальные — на `--robots`
+SINGLE_ROBOT = {
+    "move": single_robot(lambda robot: robot.move(1, Movement.FORWARD)),
+    "turn": single_robot(lambda robot: robot.turn(TurnDirection.LEFT)),
+    "auto_move": single_robot(AutonomousCleaningRobot.auto_move),
+    "clean_and_move": single_robot(AutonomousCleaningRobot.clean_and_move),
+}
+MANY_ROBOTS = {
+    "tick_objects": bench_tick_objects,
+    "tick_batch": bench_tick_batch,
+    "tick_views": bench_tick_views,
+    "tick_scheduler": bench_tick_scheduler,
+}
+BATCH_TICKS = {"tick_batch", "tick_views"}
+BENCHMARKS = {**SINGLE_ROBOT, **MANY_ROBOTS}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Запустить замеры."""
+    args = get_parser().parse_args(argv)
+    rng = random.Random(args.seed)
+
+    baseline = {}
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    report: dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "duration": args.duration,
+        "robots": args.robots,
+        "batch_robots": args.batch_robots,
+    }
+    if args.memory_robots > 0:
+        memory = bench_memory(args.memory_robots)
+        report["memory"] = memory
+        print(f"память: {memory['bytes_per_robot']:.0f} байт на робота ({args.memory_robots} роботов)", file=sys.stderr)
+        memory = bench_batch_memory(args.memory_robots)
+        report["memory_batch"] = memory
+        print(f"память пачки: {memory['bytes_per_robot']:.0f} байт на робота", file=sys.stderr)
+
+    # Таблица идет в stderr, чтобы не смешиваться с выводом приемника stdout
+    results: Results = {}
+    print(f"{'operation':<16}{'variant':>14}{'ops/s':>16}{'vs baseline':>14}", file=sys.stderr)
+    with open(os.devnull, "w") as devnull:
+        for operation in args.operations:
+            robots = args.batch_robots if operation in BATCH_TICKS else args.robots
+            if operation in SINGLE_ROBOT:
+                variants = [(name, make_sink(name, devnull)) for name in args.sinks]
+            else:
+                variants = [(f"robots={robots}", NULL_SINK)]
+
+            for variant, sink in variants:
+                result = BENCHMARKS[operation](sink, robots, args.duration, rng)
+                sink.close()
+                results.setdefault(operation, {})[variant] = result
+
+                base = baseline.get(operation, {}).get(variant)
+                ratio_text = f"{result['ops_per_second'] / base['ops_per_second']:.2f}x" if base else "-"
+                print(f"{operation:<16}{variant:>14}{result['ops_per_second']:>16.0f}{ratio_text:>14}", file=sys.stderr)
+
+    report["results"] = results
+    if baseline:
+        report["speedup"] = compare(results, baseline)
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import json
+import sys
+
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import IO, NamedTuple
+
+
+class Event(NamedTuple):
+    """Событие робота: тип, номер робота, положение, направление и собранная пыль.
+
+    `detail` уточняет событие: для `move` — смещение с учетом знака, для
+    `turn` — имя `TurnDirection`.
+    """
+
+    type: str
+    robot_id: int
+    position: tuple[int, int] | None
+    heading: str | None
+    dust: int
+    detail: int | str | None = None
+
+
+MOVEMENT_NAMES = {True: "вперед", False: "назад"}
+TURN_NAMES = {"LEFT": "налево", "RIGHT": "направо"}
+
+
+def format_event(event: Event) -> str:
+    """Строка состояния, которую робот печатал раньше"""
+    if event.type == "clean":
+        return "Начинаем уборку..."
+    if event.type == "vacuum":
+        return f"Впитывание пыли... Собрано {event.dust} единиц пыли."
+    if event.type == "move":
+        if event.detail == 0:
+            return f"Остаемся на месте. Позиция: {list(event.position)}"
+        return (
+            f"Двигаемся {MOVEMENT_NAMES[event.detail >= 0]} на {abs(event.detail)} единиц. "
+            f"Позиция: {list(event.position)}"
+        )
+    if event.type == "turn":
+        return f"Поворот {TURN_NAMES[event.detail]}. Теперь направление: {event.heading}"
+    if event.type == "path_clear":
+        return "Препятствий впереди нет, едем вперед."
+    if event.type == "obstacle":
+        return "Обнаружено препятствие! Пытаемся объехать..."
+    if event.type == "blocked":
+        return "Заблокирован со всех сторон. Остановка."
+    return str(event)
+
+
+class EventSink(ABC):
+    """Приемник событий. Если `enabled` ложно, роботы даже не создают события."""
+
+    enabled = True
+
+    @abstractmethod
+    def emit(self, event: Event) -> None:
+        """Принять одно событие"""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "EventSink":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class NullSink(EventSink):
+    """Отбрасывает все события"""
+
+    enabled = False
+
+    def emit(self, event: Event) -> None:
+        pass
+
+
+class PrintSink(EventSink):
+    """Печатает события строками состояния, как раньше печатал сам робот"""
+
+    def __init__(self, stream: IO[str] | None = None) -> None:
+        self.stream = stream
+
+    def emit(self, event: Event) -> None:
+        print(format_event(event), file=self.stream or sys.stdout)
+
+
+class RingBufferSink(EventSink):
+    """Хранит в памяти последние `capacity` событий"""
+
+    def __init__(self, capacity: int = 10000) -> None:
+        self.events: deque[Event] = deque(maxlen=capacity)
+
+    def emit(self, event: Event) -> None:
+        self.events.append(event)
+
+    def clear(self) -> None:
+        self.events.clear()
+
+
+class JsonLinesSink(EventSink):
+    """Пишет события в файл JSON Lines пачками по `batch_size` строк"""
+
+    def __init__(self, target: str | Path | IO[str], batch_size: int = 1000) -> None:
+        if isinstance(target, (str, Path)):
+            self.stream = open(target, "a", encoding="utf-8")
+            self.owns_stream = True
+        else:
+            self.stream = target
+            self.owns_stream = False
+        self.batch_size = batch_size
+        self.pending: list[str] = []
+
+    def emit(self, event: Event) -> None:
+        self.pending.append(json.dumps(event._asdict(), ensure_ascii=False))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.pending:
+            self.stream.write("\n".join(self.pending) + "\n")
+            self.pending.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self.owns_stream:
+            self.stream.close()
+
+
+PRINT_SINK = PrintSink()
@@ -0,0 +1,260 @@
+import heapq
+
+from array import array
+from collections.abc import Iterable
+
+from robot_vacuum_cleaner import DELTAS, Movement, RemoteControlCar, SensorDirection, TurnDirection
+from world import FREE, World
+
+
+Cell = tuple[int, int]
+
+UNREACHABLE = -1
+
+# Номер направления по смещению на соседнюю клетку
+DELTA_HEADINGS = {delta: heading for heading, delta in enumerate(DELTAS)}
+
+# Повороты, которыми курс меняется на (новый - старый) % 4
+TURNS = {
+    0: (),
+    1: (TurnDirection.RIGHT,),
+    2: (TurnDirection.RIGHT, TurnDirection.RIGHT),
+    3: (TurnDirection.LEFT,),
+}
+
+
+def face(robot: RemoteControlCar, heading: int) -> int:
+    """Повернуть робота к направлению номер `heading`; вернуть число поворотов"""
+    turns = TURNS[(heading - robot.heading) % len(DELTAS)]
+    for turn_direction in turns:
+        robot.turn(turn_direction)
+    return len(turns)
+
+
+class DistanceField:
+    """Расстояния по сетке от ближайшего источника (дока) до всех клеток комнаты.
+
+    Хранится массивом `array('i')` по индексам `World.grid`; `UNREACHABLE` —
+    клетка занята или до нее не доехать. Поле помнит версию карты, с которой
+    согласовано, и `refresh` дочитывает только изменения после нее. С `limit`
+    хранятся только расстояния не больше него, остальные клетки — тоже `UNREACHABLE`.
+    """
+
+    # Если изменилось больше этой доли клеток, поле дешевле пересчитать целиком
+    RECOMPUTE_FRACTION = 0.125
+
+    def __init__(self, world: World, *sources: Cell, limit: int | None = None) -> None:
+        self.world = world
+        self.sources = {world.index(*source) for source in sources}
+        self.limit = len(world.grid) if limit is None else limit
+        self.steps = tuple(world.step(delta) for delta in DELTAS)
+        self.recompute()
+
+    def recompute(self) -> None:
+        grid, steps = self.world.grid, self.steps
+        distances = array("i", [UNREACHABLE]) * len(grid)
+        frontier = [source for source in self.sources if grid[source] == FREE]
+        for source in frontier:
+            distances[source] = 0
+        distance = 0
+        while frontier and distance < self.limit:
+            distance += 1
+            following = []
+            for cell in frontier:
+                for step in steps:
+                    neighbour = cell + step
+                    if distances[neighbour] == UNREACHABLE and grid[neighbour] == FREE:
+                        distances[neighbour] = distance
+                        following.append(neighbour)
+            frontier = following
+        self.distances = distances
+        self.version = self.world.version
+
+    def refresh(self) -> None:
+        """Согласовать поле с текущей картой"""
+        world = self.world
+        if self.version == world.version:
+            return
+
+        changes = world.changes_since(self.version)
+        if changes is None:  # Поле отстало дальше, чем помнит карта
+            self.recompute()
+            return
+
+        changed = set(changes)
+        if not changed.isdisjoint(self.sources) or len(changed) > len(world.grid) * self.RECOMPUTE_FRACTION:
+            self.recompute()
+            return
+
+        grid = world.grid
+        self.close([cell for cell in changed if grid[cell] != FREE])
+        for cell in changed:
+            if grid[cell] == FREE:
+                self.open(cell)
+        self.version = world.version
+
+    def remove_sources(self, sources: Iterable[Cell]) -> None:
+        """Клетки перестают быть источниками, но остаются проходимыми"""
+        self.refresh()
+        indices = [self.world.index(*source) for source in sources]
+        self.sources.difference_update(indices)
+        self.close([index for index in indices if self.distances[index] == 0], reopen=True)
+
+    def close(self, cells: list[int], reopen: bool = False) -> None:
+        """Учесть новые препятствия: пересчитать только клетки, чьи кратчайшие пути шли через них.
+
+        С `reopen` клетки остаются проходимыми и сами получают новые расстояния.
+        """
+        distances, steps, grid = self.distances, self.steps, self.world.grid
+        heap = []
+        for cell in cells:
+            if distances[cell] != UNREACHABLE:
+                heap.append((distances[cell], cell))
+                distances[cell] = UNREACHABLE
+        heapq.heapify(heap)
+
+        # Сироты — клетки, у которых не осталось соседа на единицу ближе к источнику.
+        # Уровни разбираются по возрастанию, так что сироты уровня известны до его детей.
+        orphans = list(cells) if reopen else []
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            for step in steps:
+                child = cell + step
+                if distances[child] != distance + 1:
+                    continue
+                if any(distances[child + parent] == distance for parent in steps):
+                    continue
+                distances[child] = UNREACHABLE
+                orphans.append(child)
+                heapq.heappush(heap, (distance + 1, child))
+
+        # Сироты получают новые расстояния от соседей с уцелевшими расстояниями
+        orphan_set = set(orphans)
+        for orphan in orphans:
+            nearest = [distances[orphan + step] for step in steps if distances[orphan + step] != UNREACHABLE]
+            if nearest and min(nearest) < self.limit:
+                heap.append((min(nearest) + 1, orphan))
+        heapq.heapify(heap)
+        while heap:
+            distance, cell = heapq.heappop(heap)
+            if distances[cell] != UNREACHABLE:
+                continue
+            distances[cell] = distance
+            if distance == self.limit:
+                continue
+            for step in steps:
+                neighbour = cell + step
+                if neighbour in orphan_set and distances[neighbour] == UNREACHABLE and grid[neighbour] == FREE:
+                    heapq.heappush(heap, (distance + 1, neighbour))
+
+    def open(self, cell: int) -> None:
+        """Учесть освободившуюся клетку: расстояния могут только уменьшиться"""
+        distances, steps, grid = self.distances, self.steps, self.world.grid
+        nearest = [distances[cell + step] for step in steps if distances[cell + step] != UNREACHABLE]
+        if not nearest or min(nearest) >= self.limit:
+            return
+        distance = min(nearest) + 1
+        if distances[cell] != UNREACHABLE and distances[cell] <= distance:
+            return
+
+        distances[cell] = distance
+        frontier = [cell]
+        while frontier and distance < self.limit:
+            distance += 1
+            following = []
+            for current in frontier:
+                for step in steps:
+                    neighbour = current + step
+                    if grid[neighbour] != FREE:
+                        continue
+                    if distances[neighbour] == UNREACHABLE or distances[neighbour] > distance:
+                        distances[neighbour] = distance
+                        following.append(neighbour)
+            frontier = following
+
+    def distance(self, position: Iterable[int]) -> int | None:
+        self.refresh()
+        x, y = position
+        if not self.world.inside(x, y):
+            return None
+        distance = self.distances[self.world.index(x, y)]
+        return None if distance == UNREACHABLE else distance
+
+    def route(self, position: Iterable[int]) -> list[Cell] | None:
+        """Кратчайший путь до ближайшего источника (без стартовой клетки) спуском по полю за O(длины пути)"""
+        distance = self.distance(position)
+        if distance is None:
+            return None
+        distances, steps = self.distances, self.steps
+        cell = self.world.index(*position)
+        route = []
+        while distance > 0:
+            distance -= 1
+            cell = next(cell + step for step in steps if distances[cell + step] == distance)
+            route.append(self.world.cell(cell))
+        return route
+
+
+class Navigator:
+    """Пути роботов до зарядных доков.
+
+    Для каждого дока один раз строится `DistanceField`, после чего путь домой
+    из любой клетки — спуск по полю. При изменении карты поля не строятся
+    заново, а чинятся только в затронутой области.
+    """
+
+    def __init__(self, world: World, docks: Iterable[Iterable[int]] = ()) -> None:
+        self.world = world
+        self.fields: dict[Cell, DistanceField] = {}
+        for dock in docks:
+            self.add_dock(dock)
+
+    def add_dock(self, dock: Iterable[int]) -> None:
+        dock = tuple(dock)
+        if not self.world.inside(*dock):
+            raise ValueError(f"Док {dock} за пределами комнаты")
+        if dock not in self.fields:
+            self.fields[dock] = DistanceField(self.world, dock)
+
+    def remove_dock(self, dock: Iterable[int]) -> None:
+        del self.fields[tuple(dock)]
+
+    def nearest_dock(self, position: Iterable[int]) -> Cell | None:
+        """Ближайший достижимый док; `None`, если до всех не доехать"""
+        position = tuple(position)
+        best = None
+        for dock, field in self.fields.items():
+            distance = field.distance(position)
+            if distance is not None and (best is None or distance < best[0]):
+                best = (distance, dock)
+        return None if best is None else best[1]
+
+    def route(self, position: Iterable[int], dock: Iterable[int] | None = None) -> list[Cell] | None:
+        """Кратчайший путь до `dock` (по умолчанию — до ближайшего)"""
+        position = tuple(position)
+        dock = self.nearest_dock(position) if dock is None else tuple(dock)
+        if dock is None:
+            return None
+        return self.fields[dock].route(position)
+
+    def drive(self, robot: RemoteControlCar, dock: Iterable[int] | None = None) -> int:
+        """Довести робота до дока его же `turn`/`move`; вернуть число шагов.
+
+        Если датчик робота видит препятствие, которого нет на карте, оно
+        заносится в карту и путь строится заново по исправленному полю.
+        """
+        moves = 0
+        while True:
+            route = self.route(robot.position, dock)
+            if route is None:
+                raise ValueError(f"Из клетки {tuple(robot.position)} не доехать до дока")
+            for target in route:
+                x, y = robot.position
+                face(robot, DELTA_HEADINGS[target[0] - x, target[1] - y])
+                if robot.detect_obstacle(SensorDirection.FRONT):
+                    self.world.block(*target)
+                    break
+                robot.move(1, Movement.FORWARD)
+                moves += 1
+            else:
+                return moves
@@ -0,0 +1,233 @@
+import random
+import time
+
+from argparse import ArgumentParser
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from events import NullSink
+from navigation import DELTA_HEADINGS, DistanceField, face
+from robot_vacuum_cleaner import AutonomousCleaningRobot, Movement, SensorDirection
+from world import World
+
+
+Cell = tuple[int, int]
+
+
+@dataclass
+class CoverageReport:
+    """Итог уборки по плану"""
+
+    cells_cleaned: int
+    moves: int
+    turns: int
+    replans: int
+    planning_time: float
+
+    @property
+    def cells_per_move(self) -> float:
+        return self.cells_cleaned / max(self.moves, 1)
+
+
+def trace(previous: dict[Cell, Cell | None], goal: Cell) -> list[Cell]:
+    """Путь до `goal` по дереву поиска в ширину, без стартовой клетки"""
+    route = []
+    cell: Cell | None = goal
+    while previous[cell] is not None:
+        route.append(cell)
+        cell = previous[cell]
+    route.reverse()
+    return route
+
+
+def bfs_route(world: World, start: Cell, is_goal: Callable[[Cell], bool]) -> list[Cell] | None:
+    """Кратчайший путь по свободным клеткам до ближайшей клетки, где `is_goal` истинно.
+
+    Путь не включает `start`; `None`, если такой клетки не достичь.
+    """
+    previous: dict[Cell, Cell | None] = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell != start and is_goal(cell):
+            return trace(previous, cell)
+        for neighbour in world.neighbours(*cell):
+            if neighbour not in previous:
+                previous[neighbour] = cell
+                queue.append(neighbour)
+    return None
+
+
+def bfs_tree(world: World, start: Cell) -> dict[Cell, Cell | None]:
+    """Дерево поиска в ширину по всем клеткам, достижимым из `start`"""
+    previous: dict[Cell, Cell | None] = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        for neighbour in world.neighbours(*cell):
+            if neighbour not in previous:
+                previous[neighbour] = cell
+                queue.append(neighbour)
+    return previous
+
+
+class CoveragePlanner:
+    """Планировщик обхода комнаты «змейкой» (boustrophedon).
+
+    Робот проходит ряды вдоль оси `x`, меняя направление в конце ряда; из тупика
+    он едет к ближайшей неубранной клетке. План от каждой стартовой клетки
+    строится один раз и кэшируется, пока карта не изменится.
+    Если во время уборки впереди обнаруживается новое препятствие, оно заносится
+    в карту, а план чинится локально (`repair`): уже убранная часть и остаток
+    плана сохраняются, заново ищется только объезд.
+    """
+
+    # Поле до неубранных клеток хранит расстояния не больше этого: дальние клетки
+    # не пересчитываются на каждом тупике, а редкие дальние переезды ищутся поиском в ширину
+    SWEEP_RADIUS = 8
+
+    def __init__(self, world: World) -> None:
+        self.world = world
+        self.cache: dict[Cell, list[Cell]] = {}
+        self.cache_version = world.version
+
+    def plan(self, start: Iterable[int]) -> list[Cell]:
+        """Путь обхода всех достижимых клеток от `start` (включая ее саму)"""
+        start = tuple(start)
+        if self.cache_version != self.world.version:
+            self.cache.clear()
+            self.cache_version = self.world.version
+        if start not in self.cache:
+            self.cache[start] = self.sweep(start)
+        return self.cache[start]
+
+    def sweep(self, start: Cell) -> list[Cell]:
+        """Путь змейкой от `start` по всем достижимым клеткам.
+
+        Из тупика робот спускается по `DistanceField`, источники которого — еще
+        не посещенные клетки. Поле одно на весь обход: в тупике клетки, пройденные
+        с прошлого тупика, перестают быть источниками, и поле чинится только вокруг них.
+        """
+        world = self.world
+        free = [(x, y) for y in range(world.height) for x in range(world.width) if not world.is_blocked(x, y)]
+        unvisited = DistanceField(world, *free, limit=self.SWEEP_RADIUS)
+        visited = set()
+        path = [start]
+        cell = start
+        direction = 1
+        index = 0  # Клетки `path[index:]` еще не убраны из источников поля
+
+        while True:
+            x, y = cell
+            visited.add(cell)
+
+            for dx, dy in ((direction, 0), (0, 1), (0, -1), (-direction, 0)):
+                cell = (x + dx, y + dy)
+                if cell not in visited and not world.is_blocked(*cell):
+                    if dx != direction:
+                        direction = -direction  # Новый ряд идет в обратную сторону
+                    path.append(cell)
+                    break
+            else:
+                unvisited.remove_sources(path[index:])
+                index = len(path)
+                route = unvisited.route((x, y))
+                if route is None:  # Ближайшая неубранная клетка дальше `SWEEP_RADIUS` или ее нет
+                    route = bfs_route(world, (x, y), lambda cell: cell not in visited)
+                if route is None:
+                    return path
+                path.extend(route)
+                cell = route[-1]
+
+    def repair(self, plan: list[Cell], index: int) -> list[Cell]:
+        """Починить план, если клетка `plan[index]` оказалась занята.
+
+        Робот стоит в `plan[index - 1]` и объезжает препятствие кратчайшим путем
+        до первой еще достижимой клетки остатка плана; клетки, до которых
+        больше не добраться, выпадают из плана.
+        """
+        position = plan[index - 1]
+        previous = bfs_tree(self.world, position)
+        for rest in range(index + 1, len(plan)):
+            if plan[rest] in previous:
+                return plan[:index] + trace(previous, plan[rest]) + plan[rest + 1:]
+        return plan[:index]
+
+    def clean(self, robot: AutonomousCleaningRobot) -> CoverageReport:
+        """Убрать комнату по плану с помощью `move`/`turn` робота"""
+        started = time.perf_counter()
+        plan = self.plan(robot.position)
+        planning_time = time.perf_counter() - started
+
+        cleaned = {plan[0]}
+        robot.vacuum()
+        moves = turns = replans = 0
+        index = 1
+
+        while index < len(plan):
+            x, y = robot.position
+            target = plan[index]
+            turns += face(robot, DELTA_HEADINGS[target[0] - x, target[1] - y])
+
+            if robot.detect_obstacle(SensorDirection.FRONT):
+                started = time.perf_counter()
+                self.world.block(*target)
+                plan = self.repair(plan, index)
+                planning_time += time.perf_counter() - started
+                replans += 1
+                continue
+
+            robot.move(1, Movement.FORWARD)
+            moves += 1
+            index += 1
+            if target not in cleaned:
+                cleaned.add(target)
+                robot.vacuum()
+
+        return CoverageReport(len(cleaned), moves, turns, replans, planning_time)
+
+
+def random_world(width: int, height: int, density: float, rng: random.Random) -> World:
+    """Комната со случайными препятствиями; клетка `(0, 0)` всегда свободна"""
+    world = World(width, height)
+    for y in range(height):
+        for x in range(width):
+            if (x, y) != (0, 0) and rng.random() < density:
+                world.block(x, y)
+    return world
+
+
+def reactive_coverage(world: World, moves: int) -> int:
+    """Сколько разных клеток убирает `clean_and_move` за `moves` шагов"""
+    robot = AutonomousCleaningRobot(sink=NullSink(), world=world)
+    visited = {tuple(robot.position)}
+    for _ in range(moves):
+        robot.clean_and_move()
+        visited.add(tuple(robot.position))
+    return len(visited)
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="planner", description="Уборка комнаты по плану и реактивно.")
+    parser.add_argument("--width", type=int, default=40, help="ширина комнаты")
+    parser.add_argument("--height", type=int, default=30, help="высота комнаты")
+    parser.add_argument("--density", type=float, default=0.1, help="доля клеток с препятствиями")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+    world = random_world(args.width, args.height, args.density, random.Random(args.seed))
+
+    report = CoveragePlanner(world).clean(AutonomousCleaningRobot(sink=NullSink(), world=world))
+    reactive = reactive_coverage(world, report.moves)
+    print(f"план: убрано {report.cells_cleaned} клеток за {report.moves} шагов "
+          f"({report.cells_per_move:.3f} клетки на шаг), планирование {report.planning_time * 1000:.1f} мс")
+    print(f"реактивно: убрано {reactive} клеток за {report.moves} шагов "
+          f"({reactive / max(report.moves, 1):.3f} клетки на шаг)")
+
+
+if __name__ == "__main__":
+    main()
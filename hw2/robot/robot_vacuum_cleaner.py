@@ -1,88 +1,214 @@
-class VacuumCleaner:
-    def __init__(self) -> None:
-         self.dust_collected = 0  # Собранная пыль
-
-    def vacuum(self):
-         """Метод для всасывания пыли"""
-         self.dust_collected += 1
-         print(f"Впитывание пыли... Собрано {self.dust_collected} единиц пыли.")
-
- # Базовый класс для машины на радиоуправлении
-class RemoteControlCar:
-    def __init__(self) -> None:
-         self.position = [0, 0]  # Начальная позиция
-         self.direction = "N"  # Направление: N, E, S, W
-
-    def move_forward(self, distance: int) -> None:
-         """Метод для движения вперед"""
-         if self.direction == "N":
-             self.position[1] += distance
-         elif self.direction == "E":
-             self.position[0] += distance
-         elif self.direction == "S":
-             self.position[1] -= distance
-         elif self.direction == "W":
-             self.position[0] -= distance
-         print(f"Двигаемся вперед на {distance} единиц. Позиция: {self.position}")
-
-    def move_backward(self, distance: int) -> None:
-         """Метод для движения назад"""
-         if self.direction == "N":
-             self.position[1] -= distance
-         elif self.direction == "E":
-             self.position[0] -= distance
-         elif self.direction == "S":
-             self.position[1] += distance
-         elif self.direction == "W":
-             self.position[0] += distance
-         print(f"Двигаемся назад на {distance} единиц. Позиция: {self.position}")
-
-    def turn_left(self) -> None:
-         """Поворот налево"""
-         directions = ["N", "W", "S", "E"]
-         self.direction = directions[(directions.index(self.direction) + 1) % 4]
-         print(f"Поворот налево. Теперь направление: {self.direction}")
-
-    def turn_right(self) -> None:
-         """Поворот направо"""
-         directions = ["N", "E", "S", "W"]
-         self.direction = directions[(directions.index(self.direction) + 1) % 4]
-         print(f"Поворот направо. Теперь направление: {self.direction}")
-
- # Класс для автономного движения
-class AutonomousMovement:
-    def __init__(self) -> None:
-        self.sensors = {"front": False, "left": False, "right": False}  # Ложь означает, что препятствий нет
-
-    def detect_obstacle(self, direction) -> dict:
+from collections.abc import Iterable
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from events import PRINT_SINK, Event, EventSink
+
+if TYPE_CHECKING:
+    from world import World
+
+
+class FastEnum(Enum):
+    """Enum, члены которого хэшируются по адресу, а не Python-методом `Enum.__hash__`.
+
+    Члены — единственные экземпляры и сравниваются по `is`, так что такой хэш
+    согласован с равенством, а таблицы с членами в ключах читаются так же быстро,
+    как со строками или числами.
+    """
+
+    __hash__ = object.__hash__
+
+
+class Direction(FastEnum):
+    NORTH = "N"
+    EAST = "E"
+    SOUTH = "S"
+    WEST = "W"
+
+
+class Movement(FastEnum):
+    FORWARD = 1
+    BACKWARD = -1
+
+
+class TurnDirection(FastEnum):
+    LEFT = -1
+    RIGHT = 1
+
+
+class SensorDirection(FastEnum):
+    FRONT = "front"
+    LEFT = "left"
+    RIGHT = "right"
+
+
+# Направления по часовой стрелке: номер направления — индекс в кортеже
+HEADINGS = tuple(Direction)
+HEADING_INDEX = {direction: index for index, direction in enumerate(HEADINGS)}
+
+# Смещение (x, y) на единицу вперед для каждого номера направления
+DELTAS = ((0, 1), (1, 0), (0, -1), (-1, 0))
+DX = tuple(dx for dx, _ in DELTAS)
+DY = tuple(dy for _, dy in DELTAS)
+
+
+class MemberTable(dict):
+    """Таблица с членами Enum в ключах; чужой ключ дает `AttributeError`, как чтение `.value` у не члена"""
+
+    def __missing__(self, key):
+        raise AttributeError(f"{key!r} не член перечисления")
+
+
+# Знак шага для движения вперед или назад
+MOVEMENT_SIGN = MemberTable((movement, movement.value) for movement in Movement)
+
+# Номер направления после поворота: TURNED[turn_direction][heading]
+TURNED = MemberTable(
+    (turn_direction, tuple((heading + turn_direction.value) % len(HEADINGS) for heading in range(len(HEADINGS))))
+    for turn_direction in TurnDirection
+)
+
+
+class Position(list):
+    """Позиция `[x, y]` робота; запись по индексу сдвигает самого робота"""
+
+    __slots__ = ("robot",)
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self.robot.x, self.robot.y = self
+
+
+# Общее состояние всех частей робота. Все поля объявлены слотами одного базового
+# класса и заполняются одним `__init__`, а части добавляют только методы, поэтому
+# их можно сочетать множественным наследованием без `__dict__` у экземпляров
+# и без повторной инициализации.
+class RobotState:
+    __slots__ = ("robot_id", "sink", "x", "y", "heading", "dust_collected", "world", "_sensors")
+
+    def __init__(self, robot_id: int = 0, sink: EventSink | None = None, world: "World | None" = None) -> None:
+        self.robot_id = robot_id
+        self.sink = PRINT_SINK if sink is None else sink
+        self.dust_collected = 0  # Собранная пыль
+        self.x = self.y = 0  # Начальная позиция
+        self.heading = HEADING_INDEX[Direction.NORTH]
+        # Карта комнаты; без нее датчики задаются вручную в `sensors`
+        self.world = world
+        # Словарь датчиков создается при первом обращении; None — препятствий нет
+        self._sensors: dict[SensorDirection, bool] | None = None
+
+    def emit(self, event_type: str, detail: int | str | None = None) -> None:
+        """Отправить событие в `sink`; вызывающий сначала проверяет `sink.enabled`"""
+        position = getattr(self, "position", None)
+        direction = getattr(self, "direction", None)
+        self.sink.emit(Event(
+            event_type,
+            self.robot_id,
+            None if position is None else tuple(position),
+            None if direction is None else direction.value,
+            getattr(self, "dust_collected", 0),
+            detail,
+        ))
+
+
+class VacuumCleaner(RobotState):
+    __slots__ = ()
+
+    def vacuum(self) -> None:
+        """Метод для всасывания пыли"""
+        self.dust_collected += 1
+        if self.sink.enabled:
+            self.emit("vacuum")
+
+
+# Базовый класс для машины на радиоуправлении
+class RemoteControlCar(RobotState):
+    __slots__ = ()
+
+    @property
+    def position(self) -> Position:
+        position = Position((self.x, self.y))
+        position.robot = self
+        return position
+
+    @position.setter
+    def position(self, position: Iterable[int]) -> None:
+        self.x, self.y = position
+
+    @property
+    def direction(self) -> Direction:
+        return HEADINGS[self.heading]
+
+    @direction.setter
+    def direction(self, direction: Direction) -> None:
+        self.heading = HEADING_INDEX[direction]
+
+    def move(self, distance: int, movement: Movement) -> None:
+        """Метод для движения вперед или назад"""
+        step = distance * MOVEMENT_SIGN[movement]
+        heading = self.heading
+        self.x += DX[heading] * step
+        self.y += DY[heading] * step
+        if self.sink.enabled:
+            self.emit("move", step)
+
+    def turn(self, turn_direction: TurnDirection) -> None:
+        """Метод для поворота налево или направо"""
+        self.heading = TURNED[turn_direction][self.heading]
+        if self.sink.enabled:
+            self.emit("turn", turn_direction.name)
+
+
+# Класс для автономного движения
+class AutonomousMovement(RobotState):
+    __slots__ = ()
+
+    @property
+    def sensors(self) -> dict[SensorDirection, bool]:
+        if self._sensors is None:
+            # Ложь означает, что препятствий нет
+            self._sensors = {direction: False for direction in SensorDirection}
+        return self._sensors
+
+    @sensors.setter
+    def sensors(self, sensors: dict[SensorDirection, bool]) -> None:
+        self._sensors = sensors
+
+    def detect_obstacle(self, direction: SensorDirection) -> bool:
         """Метод для распознавания препятствия"""
-        return self.sensors[direction]
+        world = self.world
+        if world is None:
+            sensors = self._sensors
+            return sensors is not None and sensors[direction]
+        return world.sense((self.x, self.y), self.heading, direction)
 
     def auto_move(self) -> None:
         """Метод для автономного движения"""
-        if not self.detect_obstacle("front"):
-            print("Препятствий впереди нет, едем вперед.")
-            self.move_forward(1)
+        if not self.detect_obstacle(SensorDirection.FRONT):
+            if self.sink.enabled:
+                self.emit("path_clear")
+            self.move(1, Movement.FORWARD)
         else:
-            print("Обнаружено препятствие! Пытаемся объехать...")
-            if not self.detect_obstacle("left"):
-                self.turn_left()
-                self.move_forward(1)
-            elif not self.detect_obstacle("right"):
-                self.turn_right()
-                self.move_forward(1)
+            if self.sink.enabled:
+                self.emit("obstacle")
+            if not self.detect_obstacle(SensorDirection.LEFT):
+                self.turn(TurnDirection.LEFT)
+                self.move(1, Movement.FORWARD)
+            elif not self.detect_obstacle(SensorDirection.RIGHT):
+                self.turn(TurnDirection.RIGHT)
+                self.move(1, Movement.FORWARD)
             else:
-                print("Заблокирован со всех сторон. Остановка.")
+                if self.sink.enabled:
+                    self.emit("blocked")
+
 
- # Итоговый класс автономного робота для уборки
+# Итоговый класс автономного робота для уборки
 class AutonomousCleaningRobot(VacuumCleaner, RemoteControlCar, AutonomousMovement):
-    def __init__(self) -> None:
-        VacuumCleaner.__init__(self)
-        RemoteControlCar.__init__(self)
-        AutonomousMovement.__init__(self)
+    __slots__ = ()
 
     def clean_and_move(self) -> None:
         """Метод для автономной уборки и движения"""
-        print("Начинаем уборку...")
+        if self.sink.enabled:
+            self.emit("clean")
         self.vacuum()  # Включаем всасывание
-        self.auto_move()  # Автономное движение
\ No newline at end of file
+        self.auto_move()  # Автономное движение
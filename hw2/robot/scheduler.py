@@ -0,0 +1,288 @@
+import multiprocessing
+import os
+import random
+import time
+
+from argparse import ArgumentParser
+from array import array
+from collections.abc import Sequence
+from multiprocessing.shared_memory import SharedMemory
+
+from robot_vacuum_cleaner import DX, DY, HEADINGS, AutonomousCleaningRobot
+from world import FREE, World
+
+
+# Порядок проверки датчиков за такт, как в `auto_move`: вперед, налево, направо
+SENSOR_ORDER = (0, -1, 1)
+
+# Состояние, к которому подключился процесс пула
+_STATE: "SharedState | None" = None
+
+
+class SharedState:
+    """Массивы состояния роботов и карты в разделяемой памяти.
+
+    `xs`, `ys`, `dust` (`q`), `headings` (`B`) — по роботу на элемент; `grid` —
+    копия `World.grid` с рамкой из стен, `occupied` — такая же сетка, где
+    отмечены клетки с роботами. Процессы пула подключаются к блокам по именам.
+    """
+
+    FIELDS = (("xs", "q"), ("ys", "q"), ("dust", "q"), ("headings", "B"), ("grid", "B"), ("occupied", "B"))
+
+    def __init__(self, blocks: dict[str, SharedMemory], lengths: dict[str, int], stride: int, owner: bool) -> None:
+        self.blocks = blocks
+        self.stride = stride
+        self.owner = owner
+        self.steps = tuple(dx + dy * stride for dx, dy in zip(DX, DY))
+        for name, typecode in self.FIELDS:
+            size = lengths[name] * array(typecode).itemsize
+            setattr(self, name, blocks[name].buf[:size].cast(typecode))
+
+    @classmethod
+    def create(cls, robots: int, world: World) -> "SharedState":
+        lengths = {"xs": robots, "ys": robots, "dust": robots, "headings": robots}
+        lengths["grid"] = lengths["occupied"] = len(world.grid)
+        # Блок нулевой длины создать нельзя, поэтому берем хотя бы байт
+        blocks = {
+            name: SharedMemory(create=True, size=max(lengths[name] * array(typecode).itemsize, 1))
+            for name, typecode in cls.FIELDS
+        }
+        state = cls(blocks, lengths, world.stride, owner=True)
+        state.grid[:] = world.grid
+        return state
+
+    @classmethod
+    def attach(cls, names: dict[str, str], lengths: dict[str, int], stride: int) -> "SharedState":
+        blocks = {name: SharedMemory(name=block_name) for name, block_name in names.items()}
+        return cls(blocks, lengths, stride, owner=False)
+
+    def names(self) -> dict[str, str]:
+        return {name: block.name for name, block in self.blocks.items()}
+
+    def lengths(self) -> dict[str, int]:
+        return {name: len(getattr(self, name)) for name, _ in self.FIELDS}
+
+    def close(self) -> None:
+        for name, _ in self.FIELDS:
+            getattr(self, name).release()
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+
+
+def advance_shard(state: SharedState, x0: int, x1: int, members: Sequence[int]) -> array:
+    """Первая фаза такта для роботов полосы `x0 <= x < x1`.
+
+    Каждый робот собирает пыль и выбирает ход, как `clean_and_move`: вперед,
+    иначе налево, иначе направо. Ходы внутри полосы сразу записываются в общие
+    массивы (полосы не пересекаются, так что гонок нет). Ход в чужую полосу
+    возвращается заявкой `(робот, направление)`: о чужих клетках полоса знает
+    только, стена ли там, а занятость роботами проверяет планировщик.
+    """
+    xs, ys, dust, headings = state.xs, state.ys, state.dust, state.headings
+    grid, occupied, stride, steps = state.grid, state.occupied, state.stride, state.steps
+    claims = array("q")
+
+    for robot in members:
+        dust[robot] += 1
+        x = xs[robot]
+        y = ys[robot]
+        here = (y + 1) * stride + x + 1
+        heading = headings[robot]
+        for turn in SENSOR_ORDER:
+            direction = (heading + turn) % 4
+            target = here + steps[direction]
+            if grid[target] != FREE:
+                continue
+            tx = x + DX[direction]
+            if x0 <= tx < x1:
+                if occupied[target]:
+                    continue
+                occupied[here] = 0
+                occupied[target] = 1
+                xs[robot] = tx
+                ys[robot] = y + DY[direction]
+            else:
+                claims.append(robot)
+                claims.append(direction)
+            headings[robot] = direction
+            break
+
+    return claims
+
+
+def _attach(names: dict[str, str], lengths: dict[str, int], stride: int) -> None:
+    global _STATE
+    _STATE = SharedState.attach(names, lengths, stride)
+
+
+def _advance(job: tuple[int, int, array]) -> array:
+    return advance_shard(_STATE, *job)
+
+
+class TickScheduler:
+    """Пошаговое движение многих роботов, поделенное на полосы между процессами.
+
+    Комната режется на `shards` вертикальных полос; роботы каждой полосы
+    двигаются в своем процессе пула и пишут состояние прямо в разделяемую
+    память. Между полосами передаются только заявки на граничные клетки: после
+    первой фазы планировщик по порядку номеров роботов принимает заявку, если
+    клетка свободна, и отклоняет иначе — робот тогда остается на месте, но
+    сохраняет поворот. Роботы не проходят сквозь друг друга, а при одном и том
+    же числе полос результат не зависит от числа процессов.
+
+    Пул процессов заводится, только если `workers` больше 1; по умолчанию все
+    полосы двигаются в текущем процессе. `workers=None` — по процессу на ядро.
+
+    Карта копируется при создании: последующие изменения `world` не видны.
+    Датчики роботов не опрашиваются: препятствия берутся из карты `world`, поэтому
+    заданные вручную `sensors` роботов без карты не учитываются, а робот с другой
+    картой в `world` — ошибка (`ValueError`).
+    """
+
+    def __init__(
+        self,
+        world: World,
+        robots: Sequence[AutonomousCleaningRobot],
+        workers: int | None = 1,
+        shards: int | None = None,
+    ) -> None:
+        self.world = world
+        self.robots = list(robots)
+        self.workers = max(1, (os.cpu_count() or 1) if workers is None else workers)
+        self.shards = max(1, min(shards or self.workers, world.width))
+        self.ticks = 0
+
+        occupied = set()
+        for number, robot in enumerate(self.robots):
+            if robot.world is not None and robot.world is not world:
+                raise ValueError(f"Робот {number} движется по другой карте")
+            x, y = robot.position
+            if world.is_blocked(x, y):
+                raise ValueError(f"Робот {number} стоит в занятой клетке ({x}, {y})")
+            if (x, y) in occupied:
+                raise ValueError(f"Два робота в клетке ({x}, {y})")
+            occupied.add((x, y))
+
+        self.state = SharedState.create(len(self.robots), world)
+        self.members: list[set[int]] = [set() for _ in range(self.shards)]
+        for number, robot in enumerate(self.robots):
+            x, y = robot.position
+            self.state.occupied[world.index(x, y)] = 1
+            self.state.xs[number] = x
+            self.state.ys[number] = y
+            self.state.headings[number] = robot.heading
+            self.state.dust[number] = robot.dust_collected
+            self.members[self.shard_of(x)].add(number)
+
+        self.pool = None
+        if self.workers > 1:
+            self.pool = multiprocessing.Pool(
+                self.workers,
+                initializer=_attach,
+                initargs=(self.state.names(), self.state.lengths(), self.state.stride),
+            )
+
+    def shard_of(self, x: int) -> int:
+        return x * self.shards // self.world.width
+
+    def bounds(self, shard: int) -> tuple[int, int]:
+        width = self.world.width
+        return -(-shard * width // self.shards), -(-(shard + 1) * width // self.shards)
+
+    def tick(self) -> None:
+        """Продвинуть всех роботов на один такт"""
+        jobs = [(*self.bounds(shard), array("I", sorted(members))) for shard, members in enumerate(self.members)]
+        if self.pool is None:
+            results = [advance_shard(self.state, *job) for job in jobs]
+        else:
+            results = self.pool.map(_advance, jobs)
+
+        claims = sorted(pair for result in results for pair in zip(result[::2], result[1::2]))
+        state = self.state
+        stride = state.stride
+        for robot, direction in claims:
+            x, y = state.xs[robot], state.ys[robot]
+            here = (y + 1) * stride + x + 1
+            target = here + state.steps[direction]
+            if state.occupied[target]:
+                continue
+            state.occupied[here] = 0
+            state.occupied[target] = 1
+            state.xs[robot] = x + DX[direction]
+            state.ys[robot] = y + DY[direction]
+            self.members[self.shard_of(x)].discard(robot)
+            self.members[self.shard_of(x + DX[direction])].add(robot)
+
+        self.ticks += 1
+
+    def run(self, ticks: int) -> None:
+        for _ in range(ticks):
+            self.tick()
+
+    def sync(self) -> None:
+        """Записать состояние из общих массивов обратно в объекты роботов"""
+        state = self.state
+        for number, robot in enumerate(self.robots):
+            robot.x = state.xs[number]
+            robot.y = state.ys[number]
+            robot.heading = state.headings[number]
+            robot.dust_collected = state.dust[number]
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self.state.close()
+
+    def __enter__(self) -> "TickScheduler":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def random_robots(world: World, count: int, rng: random.Random) -> list[AutonomousCleaningRobot]:
+    """Роботы в случайных различных свободных клетках со случайным курсом"""
+    free = [(x, y) for y in range(world.height) for x in range(world.width) if not world.is_blocked(x, y)]
+    if count > len(free):
+        raise ValueError("Роботов больше, чем свободных клеток")
+    robots = []
+    for number, position in enumerate(rng.sample(free, count)):
+        robot = AutonomousCleaningRobot(robot_id=number, world=world)
+        robot.position = list(position)
+        robot.direction = rng.choice(HEADINGS)
+        robots.append(robot)
+    return robots
+
+
+def get_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="scheduler", description="Такты многих роботов на нескольких процессах.")
+    parser.add_argument("--robots", type=int, default=20000, help="число роботов")
+    parser.add_argument("--width", type=int, default=400, help="ширина склада")
+    parser.add_argument("--height", type=int, default=400, help="высота склада")
+    parser.add_argument("--ticks", type=int, default=50, help="число тактов")
+    parser.add_argument("--workers", type=int, default=1, help="число процессов; 0 — по числу ядер")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = get_parser().parse_args(argv)
+    rng = random.Random(args.seed)
+    world = World(args.width, args.height)
+    robots = random_robots(world, args.robots, rng)
+
+    with TickScheduler(world, robots, workers=args.workers or None) as scheduler:
+        start = time.perf_counter()
+        scheduler.run(args.ticks)
+        elapsed = time.perf_counter() - start
+
+    print(f"{scheduler.workers} процессов, {args.robots} роботов: "
+          f"{args.ticks / elapsed:.1f} тактов/с, {args.ticks * args.robots / elapsed:.0f} шагов роботов/с")
+
+
+if __name__ == "__main__":
+    main()
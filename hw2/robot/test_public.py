@@ -1,11 +1,24 @@
+import io
+import json
+import random
 import unittest
 from robot_vacuum_cleaner import (
     AutonomousCleaningRobot,
+    AutonomousMovement,
     Direction,
     Movement,
+    RemoteControlCar,
     TurnDirection,
     SensorDirection,
+    VacuumCleaner,
 )
+from batch import RobotBatch
+from events import EventSink, JsonLinesSink, NullSink, PrintSink, RingBufferSink
+from navigation import DistanceField, Navigator
+from planner import CoveragePlanner
+from scheduler import TickScheduler, random_robots
+from tracelog import TraceRecorder, TraceReplayer
+from world import World
 
 class TestAutonomousCleaningRobotMovement(unittest.TestCase):
 
@@ -159,5 +172,358 @@ class TestEnums(unittest.TestCase):
         self.assertIsInstance(Direction.NORTH, Direction)
         self.assertIsInstance(Movement.FORWARD, Movement)
 
+
+class TestCompactRobot(unittest.TestCase):
+
+    def test_slots(self):
+        robot = AutonomousCleaningRobot()
+        self.assertFalse(hasattr(robot, '__dict__'))
+        with self.assertRaises(AttributeError):
+            robot.color = "red"
+
+        robot.turn(TurnDirection.LEFT)
+        self.assertEqual(robot.heading, 3)  # Направления пронумерованы по часовой стрелке
+        robot.direction = Direction.SOUTH
+        robot.move(2, Movement.FORWARD)
+        self.assertEqual((robot.x, robot.y), (0, -2))
+
+    def test_position_writes(self):
+        robot = AutonomousCleaningRobot()
+        robot.position[0] = 5  # Как у списка-атрибута: запись по индексу двигает робота
+        self.assertEqual(robot.position, [5, 0])
+        self.assertEqual(robot.x, 5)
+
+    def test_parts_alone(self):
+        self.assertEqual(VacuumCleaner().dust_collected, 0)
+        self.assertEqual(RemoteControlCar().position, [0, 0])
+        self.assertIsNone(AutonomousMovement().world)
+
+
+class TestRobotBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = RobotBatch(3)
+        self.batch.turn(TurnDirection.RIGHT, indices=[1])
+        self.batch.turn(TurnDirection.LEFT, indices=[2])
+
+    def test_move_all(self):
+        self.batch.move(2, Movement.FORWARD)
+        self.assertEqual(self.batch.positions(), [[0, 2], [2, 0], [-2, 0]])
+        self.batch.move(1, Movement.BACKWARD, indices=[0])
+        self.assertEqual(self.batch.positions()[0], [0, 1])
+
+    def test_turn_all(self):
+        self.batch.turn(TurnDirection.RIGHT)
+        self.assertEqual(self.batch.directions(), [Direction.EAST, Direction.SOUTH, Direction.NORTH])
+
+    def test_robot_view(self):
+        # Вид ведет себя как одиночный робот и меняет массивы пачки
+        robot = self.batch.robot(1)
+        single = AutonomousCleaningRobot()
+        single.turn(TurnDirection.RIGHT)
+        for turn_direction in (TurnDirection.LEFT, TurnDirection.LEFT, TurnDirection.RIGHT):
+            robot.turn(turn_direction)
+            robot.move(3, Movement.FORWARD)
+            single.turn(turn_direction)
+            single.move(3, Movement.FORWARD)
+        self.assertEqual(robot.position, single.position)
+        self.assertEqual(robot.direction, single.direction)
+        self.assertEqual(self.batch.positions()[1], single.position)
+
+        with self.assertRaises(IndexError):
+            self.batch.robot(3)
+
+
+class TestEventSinks(unittest.TestCase):
+
+    def test_ring_buffer(self):
+        sink = RingBufferSink(capacity=3)
+        robot = AutonomousCleaningRobot(robot_id=7, sink=sink)
+        robot.clean_and_move()
+        robot.turn(TurnDirection.RIGHT)
+        self.assertEqual([event.type for event in sink.events], ["path_clear", "move", "turn"])
+        self.assertEqual(sink.events[-1].robot_id, 7)
+        self.assertEqual(sink.events[-1].position, (0, 1))
+        self.assertEqual(sink.events[-1].heading, "E")
+        self.assertEqual(sink.events[-1].dust, 1)
+
+    def test_print_and_null_sinks(self):
+        stream = io.StringIO()
+        robot = AutonomousCleaningRobot(sink=PrintSink(stream))
+        robot.move(2, Movement.BACKWARD)
+        self.assertEqual(stream.getvalue(), "Двигаемся назад на 2 единиц. Позиция: [0, -2]\n")
+
+        robot.sink = NullSink()
+        robot.clean_and_move()
+        self.assertEqual(stream.getvalue().count("\n"), 1)
+        self.assertEqual(robot.position, [0, -1])
+
+    def test_zero_move(self):
+        stream = io.StringIO()
+        robot = AutonomousCleaningRobot(sink=PrintSink(stream))
+        robot.move(0, Movement.BACKWARD)
+        self.assertEqual(stream.getvalue(), "Остаемся на месте. Позиция: [0, 0]\n")
+
+    def test_sink_is_abstract(self):
+        with self.assertRaises(TypeError):
+            EventSink()
+
+    def test_json_lines(self):
+        stream = io.StringIO()
+        with JsonLinesSink(stream, batch_size=2) as sink:
+            robot = AutonomousCleaningRobot(robot_id=1, sink=sink)
+            robot.vacuum()
+            self.assertEqual(stream.getvalue(), "")  # Пачка еще не набралась
+            robot.turn(TurnDirection.LEFT)
+            robot.move(1, Movement.FORWARD)
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([record["type"] for record in records], ["vacuum", "turn", "move"])
+        self.assertEqual(records[-1]["position"], [-1, 0])
+
+
+class TestWorld(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World.from_text([
+            "....",
+            ".#..",
+            "....",
+        ])
+
+    def test_from_text(self):
+        self.assertEqual((self.world.width, self.world.height), (4, 3))
+        self.assertTrue(self.world.is_blocked(1, 1))
+        self.assertFalse(self.world.is_blocked(1, 2))
+        self.assertTrue(self.world.is_blocked(-1, 0))  # Стена комнаты
+        self.assertEqual(self.world.render(), "....\n.#..\n....")
+
+    def test_sensors_from_world(self):
+        robot = AutonomousCleaningRobot(sink=NullSink(), world=self.world)
+        robot.position = [1, 0]
+        self.assertTrue(robot.detect_obstacle(SensorDirection.FRONT))
+        self.assertFalse(robot.detect_obstacle(SensorDirection.RIGHT))
+        self.assertFalse(robot.detect_obstacle(SensorDirection.LEFT))
+
+        robot.auto_move()  # Объезжает препятствие слева
+        self.assertEqual(robot.position, [0, 0])
+        self.assertEqual(robot.direction, Direction.WEST)
+        self.assertTrue(robot.detect_obstacle(SensorDirection.FRONT))  # Стена
+
+    def test_sense_all(self):
+        batch = RobotBatch()
+        batch.add((1, 0))
+        batch.add((0, 1), Direction.EAST)
+        batch.add((3, 2), Direction.SOUTH)
+        readings = self.world.sense_all(batch.xs, batch.ys, batch.headings)
+        self.assertEqual(readings[SensorDirection.FRONT], bytes([1, 1, 0]))
+        self.assertEqual(readings[SensorDirection.LEFT], bytes([0, 0, 1]))
+        self.assertEqual(readings[SensorDirection.RIGHT], bytes([0, 0, 0]))
+
+    def test_sense_all_outside_room(self):
+        xs = [-1, 10, 0, 2]
+        ys = [0, 10, -1, 1]
+        headings = [1, 3, 0, 0]  # Восток, запад, север, север
+        readings = self.world.sense_all(xs, ys, headings)
+        for sensor in SensorDirection:
+            expected = bytes(self.world.sense(position, heading, sensor)
+                             for position, heading in zip(zip(xs, ys), headings))
+            self.assertEqual(readings[sensor], expected)
+
+
+class TestCoveragePlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World.from_text([
+            "#.....",
+            "..##..",
+            "......",
+        ])
+        self.planner = CoveragePlanner(self.world)
+
+    def test_plan_covers_room(self):
+        plan = self.planner.plan((0, 0))
+        self.assertEqual(set(plan), {(x, y) for x in range(6) for y in range(3)} - {(0, 2), (2, 1), (3, 1)})
+        for (x1, y1), (x2, y2) in zip(plan, plan[1:]):
+            self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)  # Только соседние клетки
+
+    def test_plan_with_far_dead_end(self):
+        # Из верхнего угла до нижней половины дальше `SWEEP_RADIUS`: переезд ищется поиском в ширину
+        world = World(20, 20)
+        plan = CoveragePlanner(world).plan((10, 10))
+        self.assertEqual(set(plan), {(x, y) for x in range(20) for y in range(20)})
+        for (x1, y1), (x2, y2) in zip(plan, plan[1:]):
+            self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 1)
+
+    def test_plan_cache(self):
+        plan = self.planner.plan([0, 0])
+        self.assertIs(self.planner.plan((0, 0)), plan)
+        self.world.block(5, 2)
+        self.assertNotIn((5, 2), self.planner.plan((0, 0)))
+
+    def test_clean_with_new_obstacle(self):
+        # Карта планировщика не знает о препятствии, робот находит его датчиком
+        room = World.from_text(self.world.render().split("\n"))
+        room.block(4, 0)
+        robot = AutonomousCleaningRobot(sink=NullSink(), world=room)
+        report = self.planner.clean(robot)
+        self.assertEqual(report.replans, 1)
+        self.assertEqual(report.cells_cleaned, 14)
+        self.assertEqual(robot.dust_collected, 14)
+        self.assertTrue(self.world.is_blocked(4, 0))  # Препятствие попало в карту
+        self.assertGreater(report.cells_per_move, 0.5)
+
+
+class TestNavigation(unittest.TestCase):
+
+    def setUp(self):
+        self.world = World.from_text([
+            ".......",
+            ".#####.",
+            ".#.....",
+            ".#.###.",
+            ".......",
+        ])
+        self.navigator = Navigator(self.world, [(2, 2), (6, 0)])
+
+    def test_route(self):
+        self.assertEqual(self.navigator.nearest_dock((4, 2)), (2, 2))
+        self.assertEqual(self.navigator.route((4, 2)), [(3, 2), (2, 2)])
+        route = self.navigator.route((0, 4), dock=(2, 2))
+        self.assertEqual(len(route), 8)  # Вдоль левого края и снизу под стеной
+        self.assertEqual(route[-2:], [(2, 1), (2, 2)])
+        self.assertEqual(self.navigator.route((2, 2), dock=(2, 2)), [])
+
+    def test_incremental_refresh(self):
+        field = self.navigator.fields[2, 2]
+        self.world.block(2, 1)
+        self.assertEqual(field.distance((0, 4)), 12)  # Теперь только через правый край
+        self.assertEqual(field.version, self.world.version)
+        self.world.unblock(2, 1)
+        self.world.unblock(1, 2)
+        self.assertEqual(field.distance((0, 4)), 4)
+        self.assertEqual(list(field.distances), list(DistanceField(self.world, (2, 2)).distances))
+
+    def test_sources_and_limit(self):
+        field = DistanceField(self.world, (0, 0), (6, 4), limit=3)
+        self.assertEqual(field.distance((0, 3)), 3)
+        self.assertIsNone(field.distance((3, 2)))  # Дальше `limit` от обоих источников
+        field.remove_sources([(0, 0)])
+        self.assertIsNone(field.distance((0, 3)))
+        self.assertEqual(field.route((6, 1)), [(6, 2), (6, 3), (6, 4)])
+        self.assertEqual(list(field.distances), list(DistanceField(self.world, (6, 4), limit=3).distances))
+
+    def test_field_far_behind_map(self):
+        field = self.navigator.fields[2, 2]
+        for _ in range(World.CHANGES_KEPT // 2 + 1):  # Больше изменений, чем помнит карта
+            self.world.block(2, 1)
+            self.world.unblock(2, 1)
+        self.world.block(2, 1)
+        self.assertIsNone(self.world.changes_since(0))
+        self.assertEqual(field.distance((0, 4)), 12)
+        self.assertEqual(list(field.distances), list(DistanceField(self.world, (2, 2)).distances))
+
+    def test_drive_around_unknown_obstacle(self):
+        room = World.from_text(self.world.render().split("\n"))
+        room.block(3, 2)
+        robot = AutonomousCleaningRobot(sink=NullSink(), world=room)
+        robot.position = [6, 4]
+        moves = self.navigator.drive(robot, dock=(2, 2))
+        self.assertEqual(robot.position, [2, 2])
+        self.assertTrue(self.world.is_blocked(3, 2))  # Препятствие попало в карту
+        self.assertEqual(moves, 14)
+
+        self.world.block(2, 1)
+        with self.assertRaises(ValueError):
+            self.navigator.drive(robot, dock=(6, 0))
+
+
+class TestTickScheduler(unittest.TestCase):
+
+    def run_scheduler(self, workers):
+        world = World.from_text(["....#...", "..#.....", "........", ".....#..", "........"])
+        robots = random_robots(world, 12, random.Random(5))
+        with TickScheduler(world, robots, workers=workers, shards=3) as scheduler:
+            scheduler.run(15)
+            scheduler.sync()
+        return world, robots
+
+    def test_ticks(self):
+        world, robots = self.run_scheduler(workers=1)
+        positions = [tuple(robot.position) for robot in robots]
+        self.assertEqual(len(set(positions)), len(robots))  # Столкновений нет
+        self.assertFalse(any(world.is_blocked(*position) for position in positions))
+        self.assertEqual({robot.dust_collected for robot in robots}, {15})
+
+    def test_result_does_not_depend_on_workers(self):
+        _, single = self.run_scheduler(workers=1)
+        _, pooled = self.run_scheduler(workers=2)
+        self.assertEqual([robot.position for robot in single], [robot.position for robot in pooled])
+        self.assertEqual([robot.direction for robot in single], [robot.direction for robot in pooled])
+
+    def test_pool_is_opt_in(self):
+        world = World(4, 4)
+        with TickScheduler(world, random_robots(world, 3, random.Random(0))) as scheduler:
+            self.assertEqual(scheduler.workers, 1)
+            self.assertIsNone(scheduler.pool)
+
+    def test_robot_on_another_map(self):
+        world = World(4, 4)
+        robots = random_robots(world, 2, random.Random(0))
+        robots[0].world = World(4, 4)
+        with self.assertRaises(ValueError):
+            TickScheduler(world, robots)
+
+    def test_occupied_start(self):
+        world = World(3, 3)
+        robots = random_robots(world, 2, random.Random(0))
+        robots[1].position = list(robots[0].position)
+        with self.assertRaises(ValueError):
+            TickScheduler(world, robots, workers=1)
+
+
+class TestTraceLog(unittest.TestCase):
+
+    def setUp(self):
+        world = World.from_text(["......", ".##...", "....#.", "......"])
+        self.robot = AutonomousCleaningRobot(robot_id=3, sink=NullSink(), world=world)
+        self.stream = io.BytesIO()
+        self.states = []
+        rng = random.Random(4)
+        with TraceRecorder(self.robot, self.stream, checkpoint_interval=8) as recorder:
+            for _ in range(50):
+                self.states.append((self.robot.position, self.robot.direction, self.robot.dust_collected))
+                command = rng.randrange(4)
+                if command == 0:
+                    recorder.turn(TurnDirection.RIGHT)
+                elif command == 1:
+                    recorder.move(1, Movement.BACKWARD)
+                else:
+                    recorder.clean_and_move()
+        self.states.append((self.robot.position, self.robot.direction, self.robot.dust_collected))
+        self.stream.seek(0)
+
+    def test_state_at_any_tick(self):
+        replayer = TraceReplayer(self.stream)
+        self.assertEqual(len(replayer), 50)
+        for tick in (50, 0, 17, 8, 33, 16, 49):
+            robot = replayer.state_at(tick)
+            self.assertEqual((robot.position, robot.direction, robot.dust_collected), self.states[tick])
+            self.assertEqual(robot.robot_id, 3)
+        with self.assertRaises(IndexError):
+            replayer.state_at(51)
+
+    def test_records(self):
+        replayer = TraceReplayer(self.stream)
+        records = list(replayer.records(5))
+        self.assertEqual([record.tick for record in records], list(range(5, 50)))
+
+    def test_invalid_trace(self):
+        with self.assertRaises(ValueError):
+            TraceReplayer(io.BytesIO(b"not a robot trace"))
+        with self.assertRaises(ValueError):
+            TraceReplayer(io.BytesIO(self.stream.getvalue()[:-1]))  # Обрезанный такт
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,186 @@
+import struct
+
+from collections.abc import Iterator
+from typing import BinaryIO, NamedTuple
+
+from events import NullSink
+from robot_vacuum_cleaner import AutonomousCleaningRobot, Movement, SensorDirection, TurnDirection
+
+
+MAGIC = b"ROBOTRC"
+VERSION = 1
+
+# Заголовок: магия, версия, номер робота, период контрольных точек
+FILE_HEADER = struct.Struct("<7sBqI")
+# Контрольная точка: такт, x, y, направление, пыль
+CHECKPOINT = struct.Struct("<QqqBq")
+# Такт: команда, показания датчиков (биты SENSOR_BITS), аргумент команды
+RECORD = struct.Struct("<BBi")
+
+VACUUM, MOVE_FORWARD, MOVE_BACKWARD, TURN_LEFT, TURN_RIGHT, AUTO_MOVE, CLEAN_AND_MOVE = range(7)
+
+MOVE_COMMANDS = {Movement.FORWARD: MOVE_FORWARD, Movement.BACKWARD: MOVE_BACKWARD}
+TURN_COMMANDS = {TurnDirection.LEFT: TURN_LEFT, TurnDirection.RIGHT: TURN_RIGHT}
+SENSOR_BITS = {SensorDirection.FRONT: 1, SensorDirection.LEFT: 2, SensorDirection.RIGHT: 4}
+
+
+class TraceRecord(NamedTuple):
+    tick: int
+    command: int
+    sensors: int
+    argument: int
+
+
+def read_sensors(robot: AutonomousCleaningRobot) -> int:
+    """Показания всех датчиков робота битами `SENSOR_BITS`"""
+    detect = robot.detect_obstacle
+    return (
+        detect(SensorDirection.FRONT)
+        | detect(SensorDirection.LEFT) << 1
+        | detect(SensorDirection.RIGHT) << 2
+    )
+
+
+def apply(robot: AutonomousCleaningRobot, command: int, sensors: int, argument: int) -> None:
+    """Повторить команду такта на роботе с записанными показаниями датчиков"""
+    if command == VACUUM:
+        robot.vacuum()
+    elif command == MOVE_FORWARD:
+        robot.move(argument, Movement.FORWARD)
+    elif command == MOVE_BACKWARD:
+        robot.move(argument, Movement.BACKWARD)
+    elif command == TURN_LEFT:
+        robot.turn(TurnDirection.LEFT)
+    elif command == TURN_RIGHT:
+        robot.turn(TurnDirection.RIGHT)
+    elif command in (AUTO_MOVE, CLEAN_AND_MOVE):
+        robot.sensors = {sensor: bool(sensors & bit) for sensor, bit in SENSOR_BITS.items()}
+        if command == AUTO_MOVE:
+            robot.auto_move()
+        else:
+            robot.clean_and_move()
+    else:
+        raise ValueError(f"Неизвестная команда в трассе: {command}")
+
+
+class TraceRecorder:
+    """Запись команд робота и показаний его датчиков в бинарную трассу.
+
+    Команды вызываются через рекордер, по одной на такт. В начале трассы и
+    после каждого `checkpoint_interval`-го такта записывается контрольная точка
+    с полным состоянием робота. Блоки «точка + такты» имеют постоянный размер,
+    поэтому смещение любого такта в файле вычисляется, а не ищется.
+    """
+
+    def __init__(self, robot: AutonomousCleaningRobot, stream: BinaryIO, checkpoint_interval: int = 1024) -> None:
+        if checkpoint_interval <= 0:
+            raise ValueError("Период контрольных точек должен быть положительным")
+        self.robot = robot
+        self.stream = stream
+        self.checkpoint_interval = checkpoint_interval
+        self.tick = 0
+        self.stream.write(FILE_HEADER.pack(MAGIC, VERSION, robot.robot_id, checkpoint_interval))
+        self.checkpoint()
+
+    def checkpoint(self) -> None:
+        robot = self.robot
+        self.stream.write(CHECKPOINT.pack(self.tick, robot.x, robot.y, robot.heading, robot.dust_collected))
+
+    def record(self, command: int, sensors: int = 0, argument: int = 0) -> None:
+        """Записать такт; вызывается до команды, пока датчики видят исходное состояние"""
+        self.stream.write(RECORD.pack(command, sensors, argument))
+
+    def advance(self) -> None:
+        """Закончить такт после команды: на границе блока поставить контрольную точку"""
+        self.tick += 1
+        if self.tick % self.checkpoint_interval == 0:
+            self.checkpoint()
+
+    def vacuum(self) -> None:
+        self.record(VACUUM)
+        self.robot.vacuum()
+        self.advance()
+
+    def move(self, distance: int, movement: Movement) -> None:
+        self.record(MOVE_COMMANDS[movement], argument=distance)
+        self.robot.move(distance, movement)
+        self.advance()
+
+    def turn(self, turn_direction: TurnDirection) -> None:
+        self.record(TURN_COMMANDS[turn_direction])
+        self.robot.turn(turn_direction)
+        self.advance()
+
+    def auto_move(self) -> None:
+        self.record(AUTO_MOVE, read_sensors(self.robot))
+        self.robot.auto_move()
+        self.advance()
+
+    def clean_and_move(self) -> None:
+        self.record(CLEAN_AND_MOVE, read_sensors(self.robot))
+        self.robot.clean_and_move()
+        self.advance()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stream.flush()
+
+
+class TraceReplayer:
+    """Чтение трассы и восстановление состояния робота на любом такте.
+
+    `state_at(tick)` переходит к контрольной точке в начале блока с этим тактом
+    и повторяет не больше `checkpoint_interval` тактов. Поток должен
+    поддерживать `seek`.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        header = stream.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            raise ValueError("Это не трасса робота")
+        magic, version, self.robot_id, self.checkpoint_interval = FILE_HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Это не трасса робота")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия трассы: {version}")
+
+        self.block_size = CHECKPOINT.size + self.checkpoint_interval * RECORD.size
+        blocks, rest = divmod(stream.seek(0, 2) - FILE_HEADER.size, self.block_size)
+        records, partial = divmod(rest - CHECKPOINT.size, RECORD.size)
+        if rest < CHECKPOINT.size or partial:
+            raise ValueError("Трасса обрезана")
+        self.ticks = blocks * self.checkpoint_interval + records
+
+    def __len__(self) -> int:
+        return self.ticks
+
+    def seek_tick(self, tick: int) -> None:
+        """Перейти к записи такта `tick`"""
+        block, offset = divmod(tick, self.checkpoint_interval)
+        self.stream.seek(FILE_HEADER.size + block * self.block_size + CHECKPOINT.size + offset * RECORD.size)
+
+    def records(self, start: int = 0) -> Iterator[TraceRecord]:
+        """Такты трассы начиная со `start`"""
+        for tick in range(start, self.ticks):
+            if tick == start or tick % self.checkpoint_interval == 0:
+                self.seek_tick(tick)
+            yield TraceRecord(tick, *RECORD.unpack(self.stream.read(RECORD.size)))
+
+    def state_at(self, tick: int) -> AutonomousCleaningRobot:
+        """Робот в состоянии после первых `tick` тактов"""
+        if not 0 <= tick <= self.ticks:
+            raise IndexError(f"В трассе {self.ticks} тактов, такта {tick} нет")
+
+        block = tick // self.checkpoint_interval
+        self.stream.seek(FILE_HEADER.size + block * self.block_size)
+        robot = AutonomousCleaningRobot(robot_id=self.robot_id, sink=NullSink())
+        start, robot.x, robot.y, robot.heading, robot.dust_collected = CHECKPOINT.unpack(
+            self.stream.read(CHECKPOINT.size)
+        )
+
+        for _ in range(tick - start):
+            apply(robot, *RECORD.unpack(self.stream.read(RECORD.size)))
+        return robot
@@ -0,0 +1,152 @@
+from array import array
+from collections.abc import Iterable
+from operator import add
+
+from robot_vacuum_cleaner import DELTAS, HEADINGS, SensorDirection
+
+
+FREE = 0
+OBSTACLE = 1
+
+# Сдвиг номера направления для каждого датчика относительно курса робота
+SENSOR_TURNS = {SensorDirection.FRONT: 0, SensorDirection.LEFT: -1, SensorDirection.RIGHT: 1}
+
+
+class World:
+    """Карта занятости комнаты, общая для всех роботов.
+
+    Клетки хранятся в `bytearray` построчно, начиная с `y = 0`, и окружены рамкой
+    из препятствий: соседняя клетка в любом направлении — это индекс плюс
+    постоянное смещение, поэтому показания датчиков читаются за O(1) без
+    проверки границ. Ось `x` направлена на восток, ось `y` — на север.
+
+    Последние `CHANGES_KEPT` изменений карты хранятся в кольцевом буфере, чтобы
+    подписчики (`DistanceField`) могли дочитать их; более старые забываются.
+    """
+
+    CHANGES_KEPT = 4096
+
+    def __init__(self, width: int, height: int) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError("Размеры комнаты должны быть положительными")
+        self.width = width
+        self.height = height
+        self.version = 0  # Растет при каждом изменении карты
+        # Индекс клетки, измененной при переходе на версию `v + 1`, лежит в `changes[v % CHANGES_KEPT]`
+        self.changes = array("i", [0]) * self.CHANGES_KEPT
+        self.stride = width + 2
+        self.grid = bytearray([OBSTACLE]) * (self.stride * (height + 2))
+        for y in range(height):
+            start = self.index(0, y)
+            self.grid[start:start + width] = bytes(width)
+
+        # offsets[sensor][heading]: смещение индекса до клетки, которую видит датчик
+        self.offsets = {
+            sensor: tuple(self.step(DELTAS[(heading + turn) % len(HEADINGS)]) for heading in range(len(HEADINGS)))
+            for sensor, turn in SENSOR_TURNS.items()
+        }
+
+    @classmethod
+    def from_text(cls, lines: Iterable[str]) -> "World":
+        """Карта из строк: `#` — препятствие, любой другой символ — свободно.
+
+        Первая строка — северная стена комнаты, то есть наибольший `y`.
+        """
+        rows = [line.rstrip("\n") for line in lines]
+        world = cls(max(map(len, rows), default=0), len(rows))
+        for y, row in enumerate(reversed(rows)):
+            for x, cell in enumerate(row):
+                if cell == "#":
+                    world.block(x, y)
+        return world
+
+    def step(self, delta: tuple[int, int]) -> int:
+        dx, dy = delta
+        return dy * self.stride + dx
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def inside(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Занята ли клетка; все, что за пределами комнаты, занято"""
+        return not self.inside(x, y) or self.grid[self.index(x, y)] != FREE
+
+    def block(self, x: int, y: int) -> None:
+        self.set_cell(x, y, OBSTACLE)
+
+    def unblock(self, x: int, y: int) -> None:
+        self.set_cell(x, y, FREE)
+
+    def set_cell(self, x: int, y: int, value: int) -> None:
+        if not self.inside(x, y):
+            raise IndexError(f"Клетка ({x}, {y}) за пределами комнаты")
+        index = self.index(x, y)
+        if self.grid[index] != value:
+            self.grid[index] = value
+            self.changes[self.version % self.CHANGES_KEPT] = index
+            self.version += 1
+
+    def changes_since(self, version: int) -> list[int] | None:
+        """Индексы клеток, измененных после версии `version`; `None`, если они уже забыты"""
+        if self.version - version > self.CHANGES_KEPT:
+            return None
+        return [self.changes[old % self.CHANGES_KEPT] for old in range(version, self.version)]
+
+    def cell(self, index: int) -> tuple[int, int]:
+        """Координаты клетки по индексу в `grid`"""
+        row, col = divmod(index, self.stride)
+        return col - 1, row - 1
+
+    def neighbours(self, x: int, y: int) -> list[tuple[int, int]]:
+        """Свободные соседние клетки по сторонам света"""
+        return [(x + dx, y + dy) for dx, dy in DELTAS if not self.is_blocked(x + dx, y + dy)]
+
+    def sense(self, position: Iterable[int], heading: int, sensor: SensorDirection) -> bool:
+        """Показание датчика робота в клетке `position` с курсом номер `heading`"""
+        x, y = position
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.grid[(y + 1) * self.stride + x + 1 + self.offsets[sensor][heading]] != FREE
+        dx, dy = DELTAS[(heading + SENSOR_TURNS[sensor]) % len(HEADINGS)]
+        return self.is_blocked(x + dx, y + dy)
+
+    def sense_all(self, xs: Iterable[int], ys: Iterable[int], headings: Iterable[int]) -> dict[SensorDirection, bytes]:
+        """Показания всех датчиков сразу для многих роботов (например, массивов `RobotBatch`).
+
+        Для каждого датчика возвращаются байты: ненулевой байт — впереди препятствие.
+        Роботы внутри комнаты читаются одним проходом по `grid`; для немногих роботов
+        за ее пределами показания считаются через `sense`, как будто снаружи стена.
+        """
+        xs = list(xs)
+        ys = list(ys)
+        headings = bytes(headings)
+        stride = self.stride
+        indices = [(y + 1) * stride + x + 1 for x, y in zip(xs, ys)]
+
+        outside = []
+        if xs and (min(xs) < 0 or max(xs) >= self.width or min(ys) < 0 or max(ys) >= self.height):
+            outside = [robot for robot, (x, y) in enumerate(zip(xs, ys)) if not self.inside(x, y)]
+            inner = self.index(0, 0)  # Любая клетка комнаты: смещение датчика не выведет за рамку
+            for robot in outside:
+                indices[robot] = inner
+
+        readings = {}
+        for sensor in SensorDirection:
+            offsets = self.offsets[sensor]
+            values = bytes(map(self.grid.__getitem__, map(add, indices, map(offsets.__getitem__, headings))))
+            if outside:
+                values = bytearray(values)
+                for robot in outside:
+                    values[robot] = self.sense((xs[robot], ys[robot]), headings[robot], sensor)
+                values = bytes(values)
+            readings[sensor] = values
+        return readings
+
+    def render(self) -> str:
+        """Карта в формате `from_text`"""
+        return "\n".join(
+            "".join("#" if self.grid[self.index(x, y)] != FREE else "." for x in range(self.width))
+            for y in reversed(range(self.height))
+        )
@@ -0,0 +1,295 @@
+import json
+import random
+import sys
+import time
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from bitboard import BitBoard
+from placement import PlacementEngine
+from ships import Board, Ship, place_ships_on_board
+
+
+STANDARD_FLEET = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+BOARDS = {"board": Board, "bitboard": BitBoard}
+BATCH = 1000
+
+Layout = list[tuple[int, int, int, bool]]
+Results = dict[str, dict[str, dict[str, float]]]
+
+
+def get_parser() -> ArgumentParser:
+    """Получить парсер аргументов командной строки."""
+    parser = ArgumentParser(prog="benchmark", description="Замеры производительности морского боя.")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 20, 50, 100, 200],
+        help="размеры досок",
+    )
+    parser.add_argument(
+        "--operations",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=list(BENCHMARKS),
+        help="какие операции замерять",
+    )
+    parser.add_argument("--board", choices=list(BOARDS), default="board", help="представление доски")
+    parser.add_argument("--duration", type=float, default=1.0, help="секунд на один замер")
+    parser.add_argument("--seed", type=int, default=0, help="зерно генератора")
+    parser.add_argument("--json", type=Path, default=None, help="файл для JSON-отчета")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON-отчет прошлого запуска для сравнения")
+    return parser
+
+
+def measure(
+    function: Callable[..., object],
+    duration: float,
+    setup: Callable[[], object] | None = None,
+) -> dict[str, float]:
+    """Вызывать функцию, пока не пройдет `duration` секунд; вернуть число вызовов в секунду.
+
+    Если задана `setup`, ее результат передается в функцию перед каждым вызовом,
+    а время подготовки в замер не входит.
+    """
+    calls = 0
+    elapsed = 0.0
+
+    while elapsed < duration or calls == 0:
+        arguments = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        function(*arguments)
+        elapsed += time.perf_counter() - start
+        calls += 1
+
+    return {"calls": calls, "seconds": elapsed, "per_second": calls / elapsed}
+
+
+def with_operations(result: dict[str, float], operations: int) -> dict[str, float]:
+    """Добавить к замеру число операций за вызов и операций в секунду."""
+    result["operations"] = operations
+    result["ops_per_second"] = result["per_second"] * operations
+    return result
+
+
+def compare(results: Results, baseline: Results) -> dict[str, dict[str, float]]:
+    """Во сколько раз текущие операции в секунду больше, чем в базовом отчете.
+
+    Отчеты устроены как `{операция: {размер доски: замер}}`.
+    """
+    ratios: dict[str, dict[str, float]] = {}
+    for operation, by_variant in results.items():
+        for variant, result in by_variant.items():
+            base = baseline.get(operation, {}).get(variant)
+            if base:
+                ratios.setdefault(operation, {})[variant] = result["ops_per_second"] / base["ops_per_second"]
+    return ratios
+
+
+def scaled_fleet(board_size: int) -> list[int]:
+    """Стандартный флот, повторенный так, чтобы плотность кораблей не зависела от доски."""
+    copies = max(board_size // 10, 1) ** 2
+    return list(STANDARD_FLEET) * copies
+
+
+def random_layout(board_size: int, rng: random.Random) -> Layout:
+    """Случайная расстановка масштабированного флота: `(size, row, col, horizontal)`."""
+    sizes = sorted(scaled_fleet(board_size), reverse=True)
+    origins = PlacementEngine(board_size, sizes).solve(sizes, rng)
+    return [(size, row, col, horizontal) for size, (row, col, horizontal) in zip(sizes, origins)]
+
+
+def placed_board(board_class: type, board_size: int, layout: Layout) -> Any:
+    """Доска с расставленным по `layout` флотом."""
+    board = board_class(board_size)
+    for size, row, col, horizontal in layout:
+        board.place_ship(Ship(size), row, col, horizontal)
+    return board
+
+
+def shuffled_cells(board_size: int, rng: random.Random) -> list[tuple[int, int]]:
+    cells = [divmod(index, board_size) for index in range(board_size * board_size)]
+    rng.shuffle(cells)
+    return cells
+
+
+def bench_place_ship(board_class: type, board_size: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """`place_ship` для всех кораблей готовой расстановки на пустой доске."""
+    layout = random_layout(board_size, rng)
+
+    def setup() -> tuple[Any, list[Ship]]:
+        return board_class(board_size), [Ship(size) for size, *_ in layout]
+
+    def place(arguments: tuple[Any, list[Ship]]) -> None:
+        board, ships = arguments
+        for ship, (_, row, col, horizontal) in zip(ships, layout):
+            board.place_ship(ship, row, col, horizontal)
+
+    # Прогрев: таблицы масок `BitBoard` строятся один раз на размер доски и не входят в замер
+    place(setup())
+    return with_operations(measure(place, duration, setup), len(layout))
+
+
+def bench_is_valid_position(
+    board_class: type,
+    board_size: int,
+    duration: float,
+    rng: random.Random,
+) -> dict[str, float]:
+    """`is_valid_position` для случайных положений кораблей на заполненной доске."""
+    board = placed_board(board_class, board_size, random_layout(board_size, rng))
+    queries = []
+    for _ in range(BATCH):
+        size = rng.choice(STANDARD_FLEET)
+        horizontal = rng.random() < 0.5
+        row = rng.randrange(board_size if horizontal else board_size - size + 1)
+        col = rng.randrange(board_size - size + 1 if horizontal else board_size)
+        if horizontal:
+            queries.append([(row, col + offset) for offset in range(size)])
+        else:
+            queries.append([(row + offset, col) for offset in range(size)])
+
+    def check() -> None:
+        for positions in queries:
+            board.is_valid_position(positions)
+
+    return with_operations(measure(check, duration), BATCH)
+
+
+def bench_receive_shot(board_class: type, board_size: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """`receive_shot` по всем клеткам заполненной доски в случайном порядке."""
+    layout = random_layout(board_size, rng)
+
+    def setup() -> tuple[Any, list[tuple[int, int]]]:
+        return placed_board(board_class, board_size, layout), shuffled_cells(board_size, rng)
+
+    def shoot(arguments: tuple[Any, list[tuple[int, int]]]) -> None:
+        board, cells = arguments
+        for row, col in cells:
+            board.receive_shot(row, col)
+
+    return with_operations(measure(shoot, duration, setup), board_size * board_size)
+
+
+def bench_all_ships_sunk(board_class: type, board_size: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """`all_ships_sunk` на доске, обстрелянной наполовину."""
+    board = placed_board(board_class, board_size, random_layout(board_size, rng))
+    cells = shuffled_cells(board_size, rng)
+    for row, col in cells[:len(cells) // 2]:
+        board.receive_shot(row, col)
+
+    def check() -> None:
+        for _ in range(BATCH):
+            board.all_ships_sunk()
+
+    return with_operations(measure(check, duration), BATCH)
+
+
+def bench_place_ships_on_board(
+    board_class: type,
+    board_size: int,
+    duration: float,
+    rng: random.Random,
+) -> dict[str, float]:
+    """Случайная расстановка масштабированного флота `place_ships_on_board`.
+
+    Операция — флот целиком, поэтому `ops/s` здесь — расставленные флоты в секунду;
+    число кораблей во флоте лежит в отчете в поле `ships`.
+    """
+    sizes = scaled_fleet(board_size)
+
+    def setup() -> tuple[Any, list[Ship]]:
+        return board_class(board_size), [Ship(size) for size in sizes]
+
+    def place(arguments: tuple[Any, list[Ship]]) -> None:
+        board, ships = arguments
+        place_ships_on_board(ships, board, rng)
+
+    result = with_operations(measure(place, duration, setup), 1)
+    result["ships"] = len(sizes)
+    return result
+
+
+def bench_random_game(board_class: type, board_size: int, duration: float, rng: random.Random) -> dict[str, float]:
+    """Партия целиком: случайная расстановка и стрельба в случайном порядке до победы.
+
+    `BitBoard` играет партию на одних масках через `play_random_game`.
+    """
+    sizes = scaled_fleet(board_size)
+    shots = []
+
+    if board_class is BitBoard:
+        board = BitBoard(board_size)
+
+        def play_masks() -> None:
+            shots.append(board.play_random_game(sizes, rng))
+
+        result = with_operations(measure(play_masks, duration), 1)
+        result["mean_shots"] = sum(shots) / len(shots)
+        return result
+
+    def setup() -> tuple[Any, list[Ship], list[tuple[int, int]]]:
+        return board_class(board_size), [Ship(size) for size in sizes], shuffled_cells(board_size, rng)
+
+    def play(arguments: tuple[Any, list[Ship], list[tuple[int, int]]]) -> None:
+        board, ships, cells = arguments
+        place_ships_on_board(ships, board, rng)
+        for count, (row, col) in enumerate(cells, 1):
+            if board.receive_shot(row, col) and board.all_ships_sunk():
+                shots.append(count)
+                return
+
+    result = with_operations(measure(play, duration, setup), 1)
+    result["mean_shots"] = sum(shots) / len(shots)
+    return result
+
+
+BENCHMARKS = {
+    "place_ship": bench_place_ship,
+    "is_valid_position": bench_is_valid_position,
+    "receive_shot": bench_receive_shot,
+    "all_ships_sunk": bench_all_ships_sunk,
+    "place_ships_on_board": bench_place_ships_on_board,
+    "random_game": bench_random_game,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Запустить замеры."""
+    args = get_parser().parse_args(argv)
+    rng = random.Random(args.seed)
+    board_class = BOARDS[args.board]
+
+    baseline = {}
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())["results"]
+
+    results: Results = {}
+    print(f"{'operation':<22}{'board':>8}{'ops/s':>16}{'vs baseline':>14}")
+    for operation in args.operations:
+        for board_size in args.sizes:
+            result = BENCHMARKS[operation](board_class, board_size, args.duration, rng)
+            results.setdefault(operation, {})[str(board_size)] = result
+
+            base = baseline.get(operation, {}).get(str(board_size))
+            ratio_text = f"{result['ops_per_second'] / base['ops_per_second']:.2f}x" if base else "-"
+            print(f"{operation:<22}{board_size:>8}{result['ops_per_second']:>16.1f}{ratio_text:>14}")
+
+    if args.json is not None:
+        report = {
+            "python": sys.version.split()[0],
+            "board": args.board,
+            "duration": args.duration,
+            "results": results,
+        }
+        if baseline:
+            report["speedup"] = compare(results, baseline)
+        args.json.write_text(json.dumps(report, indent=4) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from array import array
+
+
+UNPLACED = 0xFFFF
+MAX_SHIP_SIZE = 64
+
+
+class Fleet:
+    """Флот в виде параллельных массивов: по элементу на корабль.
+
+    `rows`/`cols` — начало корабля (`UNPLACED`, пока он не размещен),
+    `horizontal` — ориентация, `sizes` — размер, `hit_masks` — битовая маска
+    подбитых клеток (бит `i` — `i`-я клетка от начала). Объекты `Ship` лишь
+    ссылаются на флот и номер в нем.
+    """
+
+    __slots__ = ("rows", "cols", "horizontal", "sizes", "hit_masks")
+
+    def __init__(self):
+        self.rows = array("H")
+        self.cols = array("H")
+        self.horizontal = bytearray()
+        self.sizes = bytearray()
+        self.hit_masks = array("Q")
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def add(self, size, row=UNPLACED, col=UNPLACED, horizontal=True, hit_mask=0):
+        """Добавить корабль; вернуть его номер."""
+        if not 0 <= size <= MAX_SHIP_SIZE:
+            raise ValueError(f"Размер корабля должен быть от 0 до {MAX_SHIP_SIZE}")
+
+        self.rows.append(row)
+        self.cols.append(col)
+        self.horizontal.append(horizontal)
+        self.sizes.append(size)
+        self.hit_masks.append(hit_mask)
+        return len(self.sizes) - 1
+
+    def record(self, index):
+        """Все поля корабля — для переноса в другой флот."""
+        return (
+            self.sizes[index],
+            self.rows[index],
+            self.cols[index],
+            bool(self.horizontal[index]),
+            self.hit_masks[index],
+        )
+
+    def place(self, index, row, col, horizontal):
+        self.rows[index] = row
+        self.cols[index] = col
+        self.horizontal[index] = horizontal
+
+    def positions(self, index):
+        row = self.rows[index]
+        if row == UNPLACED:
+            return []
+
+        col = self.cols[index]
+        size = self.sizes[index]
+        if self.horizontal[index]:
+            return [(row, col + offset) for offset in range(size)]
+        return [(row + offset, col) for offset in range(size)]
+
+    def offset(self, index, row, col):
+        """Номер клетки `(row, col)` от начала корабля."""
+        if self.horizontal[index]:
+            return col - self.cols[index]
+        return row - self.rows[index]
+
+    def hits(self, index):
+        return self.hit_masks[index].bit_count()
+
+    def hit(self, index, offset=None):
+        """Отметить попадание в клетку `offset` (или в первую неподбитую); вернуть, потоплен ли."""
+        mask = self.hit_masks[index]
+        if offset is None:
+            offset = (~mask & (mask + 1)).bit_length() - 1
+        if offset < MAX_SHIP_SIZE:
+            self.hit_masks[index] = mask | (1 << offset)
+        return self.is_sunk(index)
+
+    def is_sunk(self, index):
+        return self.hit_masks[index].bit_count() >= self.sizes[index]
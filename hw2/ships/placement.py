@@ -0,0 +1,244 @@
+import random
+
+from functools import lru_cache
+
+
+def halo_rectangle(board_size, cells):
+    """Прямоугольник `(top, left, bottom, right)` клеток корабля вместе с соседними."""
+    first_row, first_col = divmod(cells[0], board_size)
+    last_row, last_col = divmod(cells[-1], board_size)
+    return (
+        max(first_row - 1, 0),
+        max(first_col - 1, 0),
+        min(last_row + 1, board_size - 1),
+        min(last_col + 1, board_size - 1),
+    )
+
+
+class PlacementTable:
+    """Все допустимые по границам размещения корабля одного размера на доске.
+
+    Размещение — номер `pid`: сначала горизонтальные по строкам, затем вертикальные.
+    Для каждого известны начало с ориентацией, клетки (плоские номера
+    `row * size + col`) и прямоугольник окрестности, а для каждой клетки —
+    размещения, которые ее покрывают.
+    """
+
+    def __init__(self, board_size, ship_size):
+        self.board_size = board_size
+        self.ship_size = ship_size
+        self.origins = []
+        self.cells = []
+        self.halos = []
+        self.covering = [[] for _ in range(board_size * board_size)]
+
+        self.horizontal_cols = max(board_size - ship_size + 1, 0)
+        self.vertical_rows = max(board_size - ship_size + 1, 0) if ship_size > 1 else 0
+
+        for horizontal in (True, False):
+            step = 1 if horizontal else board_size
+            rows = board_size if horizontal else self.vertical_rows
+            cols = self.horizontal_cols if horizontal else board_size
+            for row in range(rows):
+                for col in range(cols):
+                    pid = len(self.origins)
+                    start = row * board_size + col
+                    cells = tuple(range(start, start + step * ship_size, step))
+                    for cell in cells:
+                        self.covering[cell].append(pid)
+                    self.origins.append((row, col, horizontal))
+                    self.cells.append(cells)
+                    self.halos.append(halo_rectangle(board_size, cells))
+
+    def __len__(self):
+        return len(self.origins)
+
+
+def may_fit(board_size, ship_sizes):
+    """Быстрая необходимая проверка, что флот вообще может поместиться на доску.
+
+    Каждый корабль вместе с полосой клеток справа и снизу — прямоугольник
+    `2 x (size + 1)`, и у некасающихся кораблей такие прямоугольники не
+    пересекаются внутри доски `(n + 1) x (n + 1)`. Кроме того, клетки корабля
+    через одну не соседствуют ни друг с другом, ни с клетками других кораблей,
+    а попарно несоседних клеток на доске не больше `ceil(n / 2) ** 2`.
+    """
+    if any(size > board_size for size in ship_sizes):
+        return False
+    half = (board_size + 1) // 2
+    area = sum(2 * (size + 1) for size in ship_sizes)
+    spread = sum((size + 1) // 2 for size in ship_sizes)
+    return area <= (board_size + 1) ** 2 and spread <= half * half
+
+
+@lru_cache(maxsize=None)
+def get_placement_table(board_size, ship_size):
+    """Закешированная таблица размещений."""
+    return PlacementTable(board_size, ship_size)
+
+
+class LiveSet:
+    """Множество номеров с удалением, возвратом и равномерным выбором за O(1)."""
+
+    __slots__ = ("items", "index_of")
+
+    def __init__(self, count):
+        self.items = list(range(count))
+        self.index_of = list(range(count))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return self.index_of[item] >= 0
+
+    def discard(self, item):
+        """Удалить элемент; вернуть `True`, если он был в множестве."""
+        index = self.index_of[item]
+        if index < 0:
+            return False
+
+        last = self.items.pop()
+        if last != item:
+            self.items[index] = last
+            self.index_of[last] = index
+        self.index_of[item] = -1
+        return True
+
+    def add(self, item):
+        self.index_of[item] = len(self.items)
+        self.items.append(item)
+
+    def choice(self, rng):
+        return self.items[rng.randrange(len(self.items))]
+
+
+class PlacementEngine:
+    """Случайная расстановка флота по живым множествам допустимых размещений.
+
+    Для каждого размера корабля хранится множество еще не отброшенных размещений,
+    а для доски — счетчики занятых окрестностей. Размещение выбирается равномерно
+    из живого множества; если оно задевает уже стоящий корабль, то удаляется из
+    множества навсегда (до отката), и выбор повторяется. Так каждое размещение
+    проверяется не более одного раза, а равномерность среди допустимых сохраняется.
+    Откат к предыдущему кораблю происходит, только когда множество опустело.
+
+    Корабли одного размера делят живое множество, поэтому размещение, перебранное
+    и отброшенное для одного из них, не вернется к следующим, пока не откатится
+    сам этот корабль. Так одинаковые корабли ставятся в порядке, в котором их
+    размещения выбирались, и каждая расстановка одинаковых кораблей
+    перебирается один раз, а не по разу на каждую их перестановку. Явный порядок
+    по номеру размещения дал бы то же, но сдвинул бы корабли к концу таблицы.
+
+    Перебор ограничен бюджетом проб: по `NODES_PER_SHIP` на корабль.
+    """
+
+    NODES_PER_SHIP = 1000
+
+    def __init__(self, board_size, ship_sizes, is_valid_position=None):
+        self.board_size = board_size
+        self.blocked = bytearray(board_size * board_size)
+        self.tables = {size: get_placement_table(board_size, size) for size in set(ship_sizes)}
+        self.live = {size: LiveSet(len(table)) for size, table in self.tables.items()}
+
+        if is_valid_position is not None:
+            for size, table in self.tables.items():
+                for pid, cells in enumerate(table.cells):
+                    positions = [divmod(cell, board_size) for cell in cells]
+                    if not is_valid_position(positions):
+                        self.live[size].discard(pid)
+
+    def _mark(self, size, pid, delta):
+        """Прибавить `delta` к счетчикам окрестности размещения."""
+        board_size = self.board_size
+        blocked = self.blocked
+        top, left, bottom, right = self.tables[size].halos[pid]
+        for row in range(top, bottom + 1):
+            base = row * board_size
+            for cell in range(base + left, base + right + 1):
+                blocked[cell] += delta
+
+    def _draw(self, size, rng, discarded):
+        """Выбрать допустимое размещение, отбрасывая недопустимые; `None`, если их нет."""
+        live = self.live[size]
+        cells = self.tables[size].cells
+        blocked = self.blocked
+
+        while len(live):
+            self.nodes -= 1
+            if self.nodes < 0:
+                raise ValueError("Не удалось разместить корабли: перебор превысил бюджет проб")
+            pid = live.choice(rng)
+            if not any(blocked[cell] for cell in cells[pid]):
+                return pid
+
+            live.discard(pid)
+            discarded.append(pid)
+
+        return None
+
+    def solve(self, ship_sizes, rng=random, budget=None):
+        """Подобрать размещения для кораблей в данном порядке.
+
+        Возвращает список `(row, col, horizontal)` той же длины, что и `ship_sizes`.
+        Если флот не помещается на доску или расстановка не нашлась за `budget`
+        проб (по умолчанию `NODES_PER_SHIP` на корабль), бросает `ValueError`.
+        """
+        if not may_fit(self.board_size, ship_sizes):
+            raise ValueError("Корабли невозможно разместить на доске")
+
+        count = len(ship_sizes)
+        self.nodes = self.NODES_PER_SHIP * count if budget is None else budget
+        chosen = [None] * count
+        discarded = [[] for _ in range(count)]
+
+        depth = 0
+        while depth < count:
+            size = ship_sizes[depth]
+            pid = self._draw(size, rng, discarded[depth])
+
+            if pid is None:
+                live = self.live[size]
+                for item in discarded[depth]:
+                    live.add(item)
+                discarded[depth] = []
+                if depth == 0:
+                    raise ValueError("Корабли невозможно разместить на доске")
+
+                depth -= 1
+                previous_size = ship_sizes[depth]
+                self._mark(previous_size, chosen[depth], -1)
+                self.live[previous_size].discard(chosen[depth])
+                discarded[depth].append(chosen[depth])
+                continue
+
+            chosen[depth] = pid
+            self._mark(size, pid, 1)
+            depth += 1
+
+        return [self.tables[size].origins[pid] for size, pid in zip(ship_sizes, chosen)]
+
+
+def place_fleet(ships, board, rng=random, budget=None):
+    """Расставить корабли на доске, начиная с самых больших.
+
+    Уже стоящие на доске корабли учитываются через `board.is_valid_position`.
+    `ValueError`, если флот не помещается или не нашелся за `budget` проб; доска
+    при этом остается прежней.
+    """
+    order = sorted((index for index in range(len(ships)) if ships[index].size), key=lambda index: -ships[index].size)
+    sizes = [ships[index].size for index in order]
+
+    # Проверять клетки через доску нужно, только если на ней уже стоят корабли с клетками;
+    # корабль без объекта `Ship` есть только у `BitBoard` и всегда занимает клетки
+    occupied = any(ship is None or ship.size for ship in board.ships)
+    engine = PlacementEngine(board.size, sizes, board.is_valid_position if occupied else None)
+    origins = engine.solve(sizes, rng, budget)
+
+    # Доска меняется только после удачного подбора. Кораблю нулевого размера клетки
+    # не нужны: он просто переходит на доску
+    for ship in ships:
+        if ship.size == 0:
+            board.place_ship(ship, 0, 0)
+    for index, (row, col, horizontal) in zip(order, origins):
+        board.place_ship(ships[index], row, col, horizontal)
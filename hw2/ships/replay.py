@@ -0,0 +1,223 @@
+import dataclasses
+import random
+import struct
+import sys
+
+from array import array
+from collections import Counter
+from io import BytesIO
+
+from bitboard import placement_masks
+from fleet import UNPLACED
+from ships import Board, Ship
+from simulation import GameBatch, SimulationResult
+
+
+MAGIC = b"SHIPLOG"
+VERSION = 1
+
+FILE_HEADER = struct.Struct("<7sB")
+RECORD_HEADER = struct.Struct("<HHI")
+
+
+def shot_typecode(board_size):
+    """Тип элементов массива выстрелов: 2 байта, если номер клетки в них помещается."""
+    return "H" if board_size * board_size <= 0x10000 else "I"
+
+
+def to_little_endian(values):
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_little_endian(typecode, data):
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+@dataclasses.dataclass
+class GameRecord:
+    """Расстановка флота и история выстрелов одной партии в виде массивов."""
+
+    board_size: int
+    rows: array
+    cols: array
+    horizontal: bytes
+    sizes: bytes
+    shots: array
+
+    @classmethod
+    def from_board(cls, board):
+        fleet = board.fleet
+        return cls(
+            board.size,
+            array("H", fleet.rows),
+            array("H", fleet.cols),
+            bytes(fleet.horizontal),
+            bytes(fleet.sizes),
+            array(shot_typecode(board.size), board.shots),
+        )
+
+    def to_board(self):
+        """Восстановить доску: поставить корабли и повторить выстрелы."""
+        board = Board(self.board_size)
+        for size, row, col, horizontal in zip(self.sizes, self.rows, self.cols, self.horizontal):
+            board.place_ship(Ship(size), row, col, bool(horizontal))
+        for shot in self.shots:
+            board.receive_shot(*divmod(shot, self.board_size))
+        return board
+
+    def fleet(self):
+        """Размеры кораблей, занимающих клетки, по убыванию."""
+        return tuple(sorted((size for size in self.sizes if size), reverse=True))
+
+    def ship_masks(self):
+        """Битовые маски кораблей — расстановка для `GameBatch`.
+
+        Корабли нулевого размера и не поставленные на доску клеток не занимают и пропускаются.
+        """
+        return [
+            placement_masks(self.board_size, size)[row, col, size == 1 or bool(horizontal)][0]
+            for size, row, col, horizontal in zip(self.sizes, self.rows, self.cols, self.horizontal)
+            if size and row != UNPLACED
+        ]
+
+    def encode(self):
+        header = RECORD_HEADER.pack(self.board_size, len(self.sizes), len(self.shots))
+        return b"".join((
+            header,
+            to_little_endian(self.rows),
+            to_little_endian(self.cols),
+            self.horizontal,
+            self.sizes,
+            to_little_endian(self.shots),
+        ))
+
+
+def encode_board(board):
+    """Закодировать доску (расстановку и выстрелы) в байты."""
+    return GameRecord.from_board(board).encode()
+
+
+def read_record(stream):
+    """Прочитать одну запись из потока; `None` в конце потока."""
+    header = stream.read(RECORD_HEADER.size)
+    if not header:
+        return None
+    if len(header) < RECORD_HEADER.size:
+        raise ValueError("Запись партии обрезана")
+
+    board_size, ship_count, shot_count = RECORD_HEADER.unpack(header)
+    typecode = shot_typecode(board_size)
+    shot_width = array(typecode).itemsize
+    payload_size = ship_count * 6 + shot_count * shot_width
+    payload = stream.read(payload_size)
+    if len(payload) < payload_size:
+        raise ValueError("Запись партии обрезана")
+
+    view = memoryview(payload)
+    cols_start = ship_count * 2
+    flags_start = ship_count * 4
+    sizes_start = ship_count * 5
+    shots_start = ship_count * 6
+    return GameRecord(
+        board_size,
+        from_little_endian("H", view[:cols_start]),
+        from_little_endian("H", view[cols_start:flags_start]),
+        bytes(view[flags_start:sizes_start]),
+        bytes(view[sizes_start:shots_start]),
+        from_little_endian(typecode, view[shots_start:]),
+    )
+
+
+def decode_board(data):
+    """Раскодировать доску из байтов `encode_board`."""
+    record = read_record(BytesIO(data))
+    if record is None:
+        raise ValueError("Пустая запись партии")
+    return record.to_board()
+
+
+class ReplayWriter:
+    """Потоковая запись журнала партий в бинарный файл."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.stream.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, game):
+        """Записать партию: `Board` или `GameRecord`."""
+        if not isinstance(game, GameRecord):
+            game = GameRecord.from_board(game)
+        self.stream.write(game.encode())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stream.flush()
+
+
+class ReplayReader:
+    """Потоковое чтение журнала партий: итерирует `GameRecord`."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        header = stream.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            raise ValueError("Это не журнал партий")
+
+        magic, version = FILE_HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Это не журнал партий")
+        if version != VERSION:
+            raise ValueError(f"Неподдерживаемая версия журнала: {version}")
+
+    def __iter__(self):
+        while True:
+            record = read_record(self.stream)
+            if record is None:
+                return
+            yield record
+
+
+def load_corpus(path):
+    """Загрузить все партии из файла журнала."""
+    with open(path, "rb") as stream:
+        return list(ReplayReader(stream))
+
+
+def replay_corpus(records, strategy, rng=None, chunk_size=1000):
+    """Сыграть расстановки из журнала новой стратегией, не расставляя флот заново.
+
+    Все партии корпуса должны быть на досках одного размера и с одним флотом,
+    иначе бросается `ValueError`.
+    """
+    rng = random.Random(0) if rng is None else rng
+    histograms = Counter()
+    board_size = None
+    fleet = ()
+
+    chunk = []
+    for record in records:
+        if board_size is None:
+            board_size, fleet = record.board_size, record.fleet()
+        elif record.board_size != board_size:
+            raise ValueError("Все партии корпуса должны быть на досках одного размера")
+        elif record.fleet() != fleet:
+            raise ValueError("Все партии корпуса должны быть с одним флотом")
+
+        chunk.append(record.ship_masks())
+        if len(chunk) == chunk_size:
+            histograms.update(GameBatch(chunk, board_size, strategy, rng).run())
+            chunk = []
+
+    if chunk:
+        histograms.update(GameBatch(chunk, board_size, strategy, rng).run())
+
+    return SimulationResult(board_size or 0, fleet, histograms)
@@ -1,61 +1,447 @@
 import random
+import sys
+
+from array import array
+
+from fleet import MAX_SHIP_SIZE, UNPLACED, Fleet
+from placement import place_fleet
+
+
+EMPTY = 0
+SHIP = 1
+MISS = 2
+HIT = 3
+
+SYMBOLS = " SOX"
+
+VISIBLE_TABLE = bytes.maketrans(bytes(range(len(SYMBOLS))), SYMBOLS.encode())
+HIDDEN_TABLE = bytes.maketrans(bytes(range(len(SYMBOLS))), SYMBOLS.replace("S", " ").encode())
+TABLES = (VISIBLE_TABLE, HIDDEN_TABLE)
+
+
+def render_header(size):
+    """Строка с номерами столбцов."""
+    return "  " + " ".join(str(col % 10) for col in range(size))
+
+
+def render_row(cells, size, row, table):
+    """Отрисовать одну строку доски, переводя коды клеток в символы по таблице."""
+    start = row * size
+    symbols = cells[start:start + size].translate(table).decode()
+    return f"{row % 10} " + " ".join(symbols)
+
+
+def render(cells, size, table):
+    """Отрисовать клетки доски построчно."""
+    lines = [render_header(size)]
+    lines.extend(render_row(cells, size, row, table) for row in range(size))
+    return "\n".join(lines)
 
 
 class Ship:
+    """Корабль — тонкое представление записи во флоте `Fleet`.
+
+    Пока корабль не поставлен на доску и не подбит, флота у него нет, а в
+    `index` хранится его размер; собственный флот из одного корабля заводится
+    при первом попадании или `place`. `Board.place_ship` переносит запись во флот
+    доски. Размер корабля — от 0 до `MAX_SHIP_SIZE`: подбитые клетки хранятся
+    64-битной маской.
+    """
+
+    __slots__ = ("fleet", "index")
+
     def __init__(self, size):
-        pass
+        if not 0 <= size <= MAX_SHIP_SIZE:
+            raise ValueError(f"Размер корабля должен быть от 0 до {MAX_SHIP_SIZE}")
+        self.fleet = None
+        self.index = size
+
+    def _own_fleet(self):
+        """Флот корабля; у еще не размещенного корабля он создается при первом обращении."""
+        if self.fleet is None:
+            fleet = Fleet()
+            self.index = fleet.add(self.index)
+            self.fleet = fleet
+        return self.fleet
+
+    @property
+    def size(self):
+        if self.fleet is None:
+            return self.index
+        return self.fleet.sizes[self.index]
+
+    @property
+    def hits(self):
+        if self.fleet is None:
+            return 0
+        return self.fleet.hits(self.index)
+
+    @property
+    def positions(self):
+        if self.fleet is None:
+            return []
+        return self.fleet.positions(self.index)
 
     def place(self, positions):
-        pass
+        positions = list(positions)
+        if not positions:
+            if self.fleet is not None:
+                self.fleet.place(self.index, UNPLACED, UNPLACED, True)
+            return
+
+        (row, col), size = positions[0], len(positions)
+        horizontal = size == 1 or positions[1][0] == row
+        expected = [
+            (row, col + offset) if horizontal else (row + offset, col) for offset in range(size)
+        ]
+        if positions != expected or size != self.size:
+            raise ValueError("Корабль занимает отрезок подряд идущих клеток своего размера")
 
-    def hit(self) -> bool:
-        pass
+        self._own_fleet().place(self.index, row, col, horizontal)
+
+    def move_to(self, fleet):
+        """Перенести запись корабля в другой флот."""
+        if self.fleet is None:
+            self.index = fleet.add(self.index)
+        else:
+            self.index = fleet.add(*self.fleet.record(self.index))
+        self.fleet = fleet
+
+    def hit(self, offset=None) -> bool:
+        return self._own_fleet().hit(self.index, offset)
 
     def is_sunk(self):
-        pass
+        if self.fleet is None:
+            return self.index == 0
+        return self.fleet.is_sunk(self.index)
 
 
 class Battleship(Ship):
+    __slots__ = ()
+
     def __init__(self):
-        pass
+        super().__init__(4)
 
 class Cruiser(Ship):
+    __slots__ = ()
+
     def __init__(self):
-        pass
+        super().__init__(3)
 
 class Destroyer(Ship):
+    __slots__ = ()
+
     def __init__(self):
-        pass
+        super().__init__(2)
 
 class Submarine(Ship):
+    __slots__ = ()
+
     def __init__(self):
-        pass
+        super().__init__(1)
+
+
+class GridRow:
+    """Строка доски только для чтения: клетки отдаются символами ' ', 'S', 'O', 'X'."""
+
+    __slots__ = ("_cells", "_start", "_size")
+
+    def __init__(self, cells, start, size):
+        self._cells = cells
+        self._start = start
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [self[index] for index in range(*col.indices(self._size))]
+        if col < 0:
+            col += self._size
+        if not 0 <= col < self._size:
+            raise IndexError("grid column out of range")
+        return SYMBOLS[self._cells[self._start + col]]
+
+    def __iter__(self):
+        row = self._cells[self._start:self._start + self._size]
+        return iter(row.translate(VISIBLE_TABLE).decode())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Grid:
+    """Представление `Board.grid`, совместимое со списком списков символов."""
+
+    __slots__ = ("_cells", "_size")
+
+    def __init__(self, cells, size):
+        self._cells = cells
+        self._size = size
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[index] for index in range(*row.indices(self._size))]
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError("grid row out of range")
+        return GridRow(self._cells, row * self._size, self._size)
+
+    def __iter__(self):
+        return (self[row] for row in range(self._size))
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
 
 
 class Board:
+    """Доска, хранящая клетки в плоском `bytearray`.
+
+    Помимо самих клеток, доска держит маску `blocked`: занятые кораблями клетки,
+    расширенные на одну клетку во все стороны. Проверка «корабли не касаются»
+    сводится к тому, что ни одна клетка нового корабля не попала в маску.
+
+    Индекс `ship_ids` хранит для каждой клетки номер корабля в `ships` и во флоте
+    `fleet` (или -1), а `unsunk` — число непотопленных кораблей, поэтому
+    `receive_shot` и `all_ships_sunk` работают за O(1). В `shots` хранится история
+    выстрелов (плоские номера клеток по порядку).
+
+    Отрисованные строки кешируются отдельно для открытой и скрытой доски;
+    изменение клетки сбрасывает кеш только ее строки. Для терминала есть
+    `redraw`, который после первой отрисовки перерисовывает через ANSI только
+    изменившиеся клетки.
+    """
+
     def __init__(self, size=10):
-        pass
+        self.size = size
+        self.cells = bytearray(size * size)
+        self.blocked = bytearray(size * size)
+        self.ship_ids = array("i", [-1]) * (size * size)
+        self.ships = []
+        self.fleet = Fleet()
+        self.shots = array("I")
+        self.unsunk = 0
+        self.grid = Grid(self.cells, size)
+        self._rows = ([None] * size, [None] * size)
+        self._dirty = (set(), set())
+        self._painted = [None, None]
 
     def is_valid_position(self, positions):
-        pass
+        size = self.size
+        blocked = self.blocked
+        for row, col in positions:
+            if not (0 <= row < size and 0 <= col < size):
+                return False
+            if blocked[row * size + col]:
+                return False
+        return True
+
+    def _dilate(self, positions):
+        """Пометить в `blocked` прямоугольник вокруг корабля, расширенный на одну клетку."""
+        if not positions:
+            return
+        rows = [row for row, _ in positions]
+        cols = [col for _, col in positions]
+        top = max(min(rows) - 1, 0)
+        bottom = min(max(rows) + 1, self.size - 1)
+        left = max(min(cols) - 1, 0)
+        right = min(max(cols) + 1, self.size - 1)
+
+        width = right - left + 1
+        mask = b"\x01" * width
+        for row in range(top, bottom + 1):
+            start = row * self.size + left
+            self.blocked[start:start + width] = mask
 
     def place_ship(self, ship, start_row, start_col, horizontal=True):
-        pass
+        if horizontal:
+            positions = [(start_row, start_col + offset) for offset in range(ship.size)]
+        else:
+            positions = [(start_row + offset, start_col) for offset in range(ship.size)]
+
+        if not self.is_valid_position(positions):
+            return False
+
+        ship_id = len(self.ships)
+        for row, col in positions:
+            index = row * self.size + col
+            self.cells[index] = SHIP
+            self.ship_ids[index] = ship_id
+            self._touch(index, hidden=False)
+        self._dilate(positions)
+
+        ship.move_to(self.fleet)
+        ship.place(positions)
+        self.ships.append(ship)
+        if not ship.is_sunk():
+            self.unsunk += 1
+        return True
+
+    def ship_at(self, row, col):
+        """Корабль, занимающий клетку, или `None`."""
+        ship_id = self.ship_ids[row * self.size + col]
+        return self.ships[ship_id] if ship_id >= 0 else None
 
     def receive_shot(self, row, col):
-        pass
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise IndexError("Выстрел за пределы доски")
+
+        index = row * self.size + col
+        cell = self.cells[index]
+        self.shots.append(index)
+
+        if cell == SHIP:
+            self.cells[index] = HIT
+            self._touch(index)
+            fleet = self.fleet
+            ship_id = self.ship_ids[index]
+            if not fleet.is_sunk(ship_id) and fleet.hit(ship_id, fleet.offset(ship_id, row, col)):
+                self.unsunk -= 1
+            return True
+
+        if cell == EMPTY:
+            self.cells[index] = MISS
+            self._touch(index)
+        return False
+
+    def _touch(self, index, hidden=True):
+        """Сбросить кеш строки клетки и запомнить клетку для `redraw`."""
+        row = index // self.size
+        self._rows[False][row] = None
+        self._dirty[False].add(index)
+        if hidden:
+            self._rows[True][row] = None
+            self._dirty[True].add(index)
+
+    def render(self, hidden=False):
+        """Отрисовать доску, пересчитывая только сброшенные строки."""
+        rows = self._rows[hidden]
+        table = TABLES[hidden]
+        for row, line in enumerate(rows):
+            if line is None:
+                rows[row] = render_row(self.cells, self.size, row, table)
+        return "\n".join([render_header(self.size), *rows])
 
     def display(self):
-        pass
+        print(self.render())
 
     def display_hidden(self):
-        pass
+        print(self.render(hidden=True))
+
+    def redraw(self, hidden=False, origin=(1, 1), stream=None):
+        """Отрисовать доску в терминале с позиции `origin` (строка, столбец, с 1).
+
+        Первый вызов (или вызов с другим `origin`) рисует доску целиком, следующие
+        переставляют курсор ANSI-последовательностями и перерисовывают только
+        клетки, изменившиеся с прошлого вызова. После отрисовки курсор ставится
+        под доску.
+        """
+        stream = sys.stdout if stream is None else stream
+        top, left = origin
+        dirty = self._dirty[hidden]
+
+        if self._painted[hidden] != origin:
+            lines = self.render(hidden).split("\n")
+            parts = [f"\x1b[{top + offset};{left}H{line}" for offset, line in enumerate(lines)]
+            self._painted[hidden] = origin
+        else:
+            symbols = SYMBOLS if not hidden else SYMBOLS.replace("S", " ")
+            parts = []
+            for index in sorted(dirty):
+                row, col = divmod(index, self.size)
+                symbol = symbols[self.cells[index]]
+                parts.append(f"\x1b[{top + 1 + row};{left + 2 + 2 * col}H{symbol}")
+
+        dirty.clear()
+        parts.append(f"\x1b[{top + self.size + 1};1H")
+        stream.write("".join(parts))
+        stream.flush()
 
     def all_ships_sunk(self):
-        pass
+        return self.unsunk == 0
+
+
+def place_ships_on_board(ships, board, rng=random):
+    place_fleet(ships, board, rng)
+
+
+def ask_shot(board):
+    """Спросить координаты выстрела у игрока."""
+    row = int(input(f"Введите номер строки для выстрела (0-{board.size - 1}): "))
+    col = int(input(f"Введите номер столбца для выстрела (0-{board.size - 1}): "))
+    return row, col
+
+
+def main(strategy=None):
+    """Запустить игру.
+
+    Без `strategy` координаты выстрелов спрашиваются через `input()`. Иначе
+    `strategy(board_size, ship_sizes, rng)` создает стратегию с методами
+    `next_shot()` и `record(row, col, hit, sunk)`, и она стреляет вместо игрока.
+    """
+    player_board = Board()
+    opponent_board = Board()
+
+    ships = [Battleship(), Cruiser(), Cruiser(), Destroyer(), Destroyer(), Destroyer(),
+             Submarine(), Submarine(), Submarine(), Submarine()]
+    opponent_ships = [type(ship)() for ship in ships]
+
+    # Размещение кораблей игрока
+    place_ships_on_board(ships, player_board)
+
+    # Размещение кораблей противника
+    place_ships_on_board(opponent_ships, opponent_board)
+
+    targeter = None
+    if strategy is not None:
+        targeter = strategy(opponent_board.size, [ship.size for ship in opponent_ships], random)
+
+    print("Ваше поле (Сверху) и поле противника (снизу):")
+    player_board.display()
+    print("\nПоле противника:")
+    opponent_board.display_hidden()
+
+    shots = 0
+    while not opponent_board.all_ships_sunk():
+        try:
+            if targeter is None:
+                row, col = ask_shot(opponent_board)
+            else:
+                row, col = targeter.next_shot()
+                print(f"Выстрел: ({row}, {col})")
+            if row < 0 or row >= opponent_board.size or col < 0 or col >= opponent_board.size:
+                print("Некорректные координаты, попробуйте снова.")
+                continue
+            hit = opponent_board.receive_shot(row, col)
+            shots += 1
+            if hit:
+                print("Попадание!")
+            else:
+                print("Промах!")
+
+            if targeter is not None:
+                ship = opponent_board.ship_at(row, col)
+                sunk = ship.positions if hit and ship.is_sunk() else None
+                targeter.record(row, col, hit, sunk)
+
+            print("Ваше поле (Сверху) и поле противника (снизу):")
+            player_board.display()
+            print("\nПоле противника:")
+            opponent_board.display_hidden()
 
+        except ValueError:
+            print("Пожалуйста, вводите числа.")
 
-def place_ships_on_board(ships, board):
-    pass
+    print(f"Все корабли противника потоплены за {shots} выстрелов! Игра окончена.")
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import dataclasses
+import os
+import random
+import statistics
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import iter_bits, placement_masks
+from placement import PlacementEngine
+
+
+STANDARD_FLEET = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+
+class RandomTargeter:
+    """Стреляет по еще не обстрелянным клеткам в случайном порядке."""
+
+    def __init__(self, board_size, ship_sizes, rng=random):
+        self.order = [divmod(index, board_size) for index in range(board_size * board_size)]
+        rng.shuffle(self.order)
+
+    def next_shot(self):
+        return self.order.pop()
+
+    def record(self, row, col, hit, sunk):
+        pass
+
+
+class HuntTargetTargeter:
+    """Случайный поиск, а после попадания — добивание соседних клеток.
+
+    Клетки вокруг потопленного корабля не обстреливаются: по правилам там пусто.
+    """
+
+    def __init__(self, board_size, ship_sizes, rng=random):
+        self.size = board_size
+        self.unknown = set(range(board_size * board_size))
+        self.order = list(self.unknown)
+        rng.shuffle(self.order)
+        self.targets = []
+
+    def next_shot(self):
+        for queue in (self.targets, self.order):
+            while queue:
+                index = queue.pop()
+                if index in self.unknown:
+                    return divmod(index, self.size)
+
+        raise RuntimeError("Все клетки доски уже обстреляны")
+
+    def record(self, row, col, hit, sunk):
+        size = self.size
+        self.unknown.discard(row * size + col)
+        if not hit:
+            return
+
+        if sunk:
+            for cell_row, cell_col in sunk:
+                for near_row in range(max(cell_row - 1, 0), min(cell_row + 2, size)):
+                    for near_col in range(max(cell_col - 1, 0), min(cell_col + 2, size)):
+                        self.unknown.discard(near_row * size + near_col)
+            self.targets.clear()
+            return
+
+        for near_row, near_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= near_row < size and 0 <= near_col < size:
+                self.targets.append(near_row * size + near_col)
+
+
+@dataclasses.dataclass
+class SimulationResult:
+    """Распределение числа выстрелов до победы."""
+
+    board_size: int
+    fleet: tuple
+    histogram: Counter
+
+    @property
+    def games(self):
+        return sum(self.histogram.values())
+
+    def samples(self):
+        for shots, count in sorted(self.histogram.items()):
+            yield from [shots] * count
+
+    def summary(self):
+        samples = list(self.samples())
+        if not samples:
+            return {"games": 0, "min": None, "mean": None, "median": None, "p10": None, "p90": None, "max": None}
+        deciles = statistics.quantiles(samples, n=10) if len(samples) > 1 else samples * 9
+        return {
+            "games": len(samples),
+            "min": samples[0],
+            "mean": statistics.fmean(samples),
+            "median": statistics.median(samples),
+            "p10": deciles[0],
+            "p90": deciles[-1],
+            "max": samples[-1],
+        }
+
+    def merge(self, other):
+        self.histogram.update(other.histogram)
+        return self
+
+
+class GameBatch:
+    """Пачка независимых партий, хранимая по столбцам.
+
+    Для каждой партии `g` — битовые маски кораблей `occupied[g]`, выстрелов
+    `shots[g]`, маски отдельных кораблей `ship_masks[g]`, число выстрелов
+    `shot_counts[g]` и стратегия `targeters[g]`. Один такт делает по выстрелу
+    во всех незавершенных партиях.
+
+    Это не векторная обработка: стратегии — отдельные объекты Python, поэтому
+    такт остается циклом по партиям, а столбцы лишь избавляют его от объектов
+    досок и кораблей.
+    """
+
+    def __init__(self, layouts, board_size, strategy, rng):
+        """Создать пачку по готовым расстановкам: списку масок кораблей каждой партии."""
+        games = len(layouts)
+        self.board_size = board_size
+        self.occupied = [sum(masks) for masks in layouts]
+        self.shots = [0] * games
+        self.ship_masks = list(layouts)
+        self.shot_counts = [0] * games
+        self.targeters = [
+            strategy(board_size, tuple(mask.bit_count() for mask in masks), rng)
+            for masks in layouts
+        ]
+        self.active = list(range(games))
+
+    @classmethod
+    def random(cls, games, board_size, fleet, strategy, rng):
+        """Создать пачку со случайными расстановками флота."""
+        sizes = sorted(fleet, reverse=True)
+        tables = {size: placement_masks(board_size, size) for size in set(sizes)}
+        layouts = []
+        for _ in range(games):
+            origins = PlacementEngine(board_size, sizes).solve(sizes, rng)
+            layouts.append([tables[size][origin][0] for size, origin in zip(sizes, origins)])
+        return cls(layouts, board_size, strategy, rng)
+
+    def step(self):
+        """Сделать один такт; вернуть партии, завершившиеся на нем."""
+        board_size = self.board_size
+        limit = board_size * board_size
+        finished = []
+        still_active = []
+
+        for game in self.active:
+            targeter = self.targeters[game]
+            row, col = targeter.next_shot()
+            bit = 1 << (row * board_size + col)
+            shots = self.shots[game] | bit
+            self.shots[game] = shots
+            self.shot_counts[game] += 1
+
+            hit = bool(self.occupied[game] & bit)
+            sunk = None
+            if hit:
+                for mask in self.ship_masks[game]:
+                    if mask & bit:
+                        if not mask & ~shots:
+                            sunk = [divmod(cell, board_size) for cell in iter_bits(mask)]
+                        break
+            targeter.record(row, col, hit, sunk)
+
+            if self.shot_counts[game] > limit:
+                raise RuntimeError("Стратегия сделала больше выстрелов, чем клеток на доске")
+
+            if self.occupied[game] & ~shots:
+                still_active.append(game)
+            else:
+                finished.append(game)
+
+        self.active = still_active
+        return finished
+
+    def run(self):
+        """Доиграть все партии; вернуть гистограмму числа выстрелов."""
+        histogram = Counter()
+        while self.active:
+            for game in self.step():
+                histogram[self.shot_counts[game]] += 1
+        return histogram
+
+
+def run_chunk(games, board_size, fleet, strategy, seed):
+    """Сыграть пачку партий в одном процессе."""
+    rng = random.Random(seed)
+    histogram = GameBatch.random(games, board_size, fleet, strategy, rng).run()
+    return SimulationResult(board_size, tuple(fleet), histogram)
+
+
+def simulate(
+    games,
+    strategy=RandomTargeter,
+    board_size=10,
+    fleet=STANDARD_FLEET,
+    workers=1,
+    chunk_size=1000,
+    seed=0,
+):
+    """Сыграть `games` партий, разбив их на пачки по процессам.
+
+    `strategy(board_size, fleet, rng)` создает стратегию одной партии с методами
+    `next_shot() -> (row, col)` и `record(row, col, hit, sunk)`, где `sunk` —
+    клетки потопленного корабля или `None`. Стратегия должна сериализоваться
+    через `pickle` (класс или функция уровня модуля).
+
+    По умолчанию все считается в текущем процессе: пул окупается, только когда
+    ядер несколько, а пачек не меньше, чем процессов. `workers=None` берет все
+    ядра, но не больше, чем пачек. Партии пачки зависят только от `seed` и
+    `chunk_size`, так что результат не зависит от числа процессов.
+    """
+    chunks = []
+    remaining = games
+    while remaining > 0:
+        chunks.append(min(chunk_size, remaining))
+        remaining -= chunks[-1]
+
+    seeds = [seed * 1_000_003 + index for index in range(len(chunks))]
+    arguments = [
+        (count, board_size, tuple(fleet), strategy, chunk_seed)
+        for count, chunk_seed in zip(chunks, seeds)
+    ]
+
+    result = SimulationResult(board_size, tuple(fleet), Counter())
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        for args in arguments:
+            result.merge(run_chunk(*args))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_result in pool.map(run_chunk, *zip(*arguments)):
+            result.merge(chunk_result)
+    return result
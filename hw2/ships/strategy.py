@@ -0,0 +1,175 @@
+import random
+
+from collections import Counter
+
+from placement import get_placement_table
+
+
+UNKNOWN = 0
+EMPTY = 1
+HIT = 2
+SUNK = 3
+
+
+class ProbabilityTargeter:
+    """Стратегия по карте плотности размещений.
+
+    `density[cell]` — сколько допустимых размещений оставшихся кораблей покрывают
+    клетку (размещение корабля размера `L` считается столько раз, сколько таких
+    кораблей еще не потоплено). Размещение становится недопустимым, когда задевает
+    клетку, где корабля точно нет (промах, диагональ от попадания, окрестность или
+    сам потопленный корабль) либо касается попадания, не проходя через него.
+    После выстрела пересчитываются только размещения,
+    покрывающие эти клетки.
+
+    Пока есть попадания в непотопленные корабли, выбирается клетка, которую чаще
+    всего покрывают размещения через эти попадания (добивание). Иначе — клетка
+    с максимальной плотностью (поиск).
+
+    Интерфейс совпадает со стратегиями из `simulation`: `next_shot()` и
+    `record(row, col, hit, sunk)`.
+    """
+
+    def __init__(self, board_size, ship_sizes, rng=random):
+        self.size = board_size
+        self.remaining = Counter(ship_sizes)
+        self.tables = {size: get_placement_table(board_size, size) for size in self.remaining}
+        self.live = {size: bytearray(b"\x01") * len(table) for size, table in self.tables.items()}
+        self.state = bytearray(board_size * board_size)
+        self.pending = set()
+
+        self.density = [0] * (board_size * board_size)
+        for size, table in self.tables.items():
+            weight = self.remaining[size]
+            for cells in table.cells:
+                for cell in cells:
+                    self.density[cell] += weight
+
+        self.order = list(range(board_size * board_size))
+        rng.shuffle(self.order)
+
+    def _exclude(self, cell, unless_covers=None):
+        """Убрать живые размещения, покрывающие клетку (кроме покрывающих `unless_covers`)."""
+        density = self.density
+        for size, table in self.tables.items():
+            live = self.live[size]
+            weight = self.remaining[size]
+            for pid in table.covering[cell]:
+                if not live[pid]:
+                    continue
+                cells = table.cells[pid]
+                if unless_covers is not None and unless_covers in cells:
+                    continue
+                live[pid] = 0
+                for covered in cells:
+                    density[covered] -= weight
+
+    def _mark_empty(self, cell):
+        if self.state[cell] == UNKNOWN:
+            self.state[cell] = EMPTY
+            self._exclude(cell)
+
+    def _retire(self, size):
+        """Уменьшить вес размещений размера `size` после потопления такого корабля."""
+        self.remaining[size] -= 1
+        live = self.live.get(size)
+        if live is None:
+            return
+
+        density = self.density
+        table = self.tables[size]
+        for pid, alive in enumerate(live):
+            if alive:
+                for cell in table.cells[pid]:
+                    density[cell] -= 1
+
+        if self.remaining[size] == 0:
+            del self.tables[size]
+            del self.live[size]
+
+    def _neighbours(self, cell):
+        """Соседние клетки: пары `(клетка, диагональная ли)`."""
+        size = self.size
+        row, col = divmod(cell, size)
+        for near_row in range(max(row - 1, 0), min(row + 2, size)):
+            for near_col in range(max(col - 1, 0), min(col + 2, size)):
+                if near_row != row or near_col != col:
+                    yield near_row * size + near_col, near_row != row and near_col != col
+
+    def record(self, row, col, hit, sunk):
+        cell = row * self.size + col
+        if not hit:
+            self._mark_empty(cell)
+            return
+
+        self.state[cell] = HIT
+        self.pending.add(cell)
+        for near, diagonal in self._neighbours(cell):
+            if diagonal:
+                self._mark_empty(near)
+            else:
+                self._exclude(near, unless_covers=cell)
+
+        if not sunk:
+            return
+
+        cells = [ship_row * self.size + ship_col for ship_row, ship_col in sunk]
+        self._retire(len(cells))
+        for ship_cell in cells:
+            self.state[ship_cell] = SUNK
+            self.pending.discard(ship_cell)
+            self._exclude(ship_cell)
+        for ship_cell in cells:
+            for near, _ in self._neighbours(ship_cell):
+                self._mark_empty(near)
+
+    def _target_scores(self):
+        """Очки клеток для добивания: размещения через попадания, с весом по числу попаданий."""
+        state = self.state
+        pending = self.pending
+        scores = Counter()
+        seen = set()
+
+        for hit_cell in pending:
+            for size, table in self.tables.items():
+                live = self.live[size]
+                weight = self.remaining[size]
+                for pid in table.covering[hit_cell]:
+                    if not live[pid] or (size, pid) in seen:
+                        continue
+                    seen.add((size, pid))
+                    cells = table.cells[pid]
+                    hits = sum(1 for covered in cells if covered in pending)
+                    for covered in cells:
+                        if state[covered] == UNKNOWN:
+                            scores[covered] += weight * hits * hits
+        return scores
+
+    def next_shot(self):
+        state = self.state
+        best = None
+
+        if self.pending:
+            scores = self._target_scores()
+            best_score = 0
+            for cell in self.order:
+                score = scores.get(cell, 0)
+                if score > best_score:
+                    best, best_score = cell, score
+
+        if best is None:
+            density = self.density
+            best_score = -1
+            for cell in self.order:
+                if state[cell] == UNKNOWN and density[cell] > best_score:
+                    best, best_score = cell, density[cell]
+
+        if best is None:
+            raise RuntimeError("Все клетки доски уже обстреляны")
+        return divmod(best, self.size)
+
+
+if __name__ == "__main__":
+    from ships import main
+
+    main(ProbabilityTargeter)
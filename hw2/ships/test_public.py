@@ -1,4 +1,13 @@
-from ships import Ship, Board
+import io
+import random
+import time
+from ships import Ship, Battleship, Board, place_ships_on_board
+from bitboard import BitBoard
+from placement import PlacementEngine
+from simulation import HuntTargetTargeter, simulate
+from strategy import EMPTY, HIT, UNKNOWN, ProbabilityTargeter
+from replay import ReplayReader, ReplayWriter, decode_board, encode_board, read_record, replay_corpus
+from enumeration import ExactTargeter, FleetEnumerator, TooManyStates, board_state
 import unittest
 
 
@@ -26,6 +35,30 @@ class TestShip(unittest.TestCase):
         ship.hit()
         self.assertTrue(ship.is_sunk())  # После трёх попаданий, корабль должен быть потоплен
 
+    def test_ship_place_vertical(self):
+        ship = Ship(2)
+        ship.place([(3, 5), (4, 5)])
+        self.assertEqual(ship.positions, [(3, 5), (4, 5)])
+
+        with self.assertRaises(ValueError):
+            ship.place([(0, 0), (1, 1)])  # Клетки не идут подряд
+
+    def test_ship_is_compact(self):
+        ship = Battleship()
+        self.assertFalse(hasattr(ship, '__dict__'))
+        self.assertEqual(ship.size, 4)
+        self.assertIsNone(ship.fleet)  # Флот заводится только при размещении или попадании
+
+    def test_ship_size_limits(self):
+        board = Board()
+        ships = [Ship(0), Ship(2)]
+        place_ships_on_board(ships, board)
+        self.assertTrue(ships[0].is_sunk())
+        self.assertEqual(len(ships[1].positions), 2)
+
+        with self.assertRaises(ValueError):
+            Ship(65)  # Подбитые клетки хранятся 64-битной маской
+
 
 class TestBoard(unittest.TestCase):
 
@@ -70,6 +103,14 @@ class TestBoard(unittest.TestCase):
         self.assertTrue(hit)  # Попадание
         self.assertEqual(self.board.grid[0][0], 'X')
 
+    def test_shot_outside_board(self):
+        self.board.place_ship(Ship(1), 0, 0)
+        for row, col in ((-1, 0), (0, 10), (10, 0), (0, -1)):
+            with self.assertRaises(IndexError):
+                self.board.receive_shot(row, col)
+        self.assertEqual(sum(list(row).count('O') for row in self.board.grid), 0)  # Доска не изменилась
+        self.assertFalse(self.board.all_ships_sunk())
+
     def test_all_ships_sunk(self):
         ship1 = Ship(2)
         ship2 = Ship(1)
@@ -83,6 +124,355 @@ class TestBoard(unittest.TestCase):
 
         self.assertTrue(self.board.all_ships_sunk())  # Все корабли должны быть потоплены
 
+    def test_ship_at(self):
+        ship = Ship(2)
+        self.board.place_ship(ship, 3, 4, horizontal=False)
+        self.assertIs(self.board.ship_at(3, 4), ship)
+        self.assertIs(self.board.ship_at(4, 4), ship)
+        self.assertIsNone(self.board.ship_at(5, 4))
+
+        self.board.receive_shot(3, 4)
+        self.board.receive_shot(3, 4)  # Повторный выстрел не считается попаданием
+        self.assertEqual(ship.hits, 1)
+        self.assertFalse(self.board.all_ships_sunk())
+
+        self.board.receive_shot(4, 4)
+        self.assertTrue(ship.is_sunk())
+        self.assertTrue(self.board.all_ships_sunk())
+
+    def test_hit_marks_the_shot_cell(self):
+        ship = Ship(3)
+        self.board.place_ship(ship, 2, 5, horizontal=False)
+        self.board.receive_shot(4, 5)
+        self.assertEqual(ship.fleet.hit_masks[ship.index], 0b100)  # Подбита последняя клетка
+        self.board.receive_shot(2, 5)
+        self.assertEqual(ship.fleet.hit_masks[ship.index], 0b101)
+
+    def test_adjacent_ship_placement(self):
+        ship1 = Ship(2)
+        ship2 = Ship(2)
+        self.board.place_ship(ship1, 0, 0, horizontal=True)
+        placed = self.board.place_ship(ship2, 1, 2, horizontal=True)  # Касается по диагонали
+        self.assertFalse(placed)
+        self.assertEqual(self.board.grid[1][2], ' ')
+        self.assertTrue(self.board.place_ship(ship2, 0, 3, horizontal=True))
+
+    def test_place_ships_on_board(self):
+        ships = [Ship(size) for size in (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)]
+        place_ships_on_board(ships, self.board)
+        self.assertEqual(len(self.board.ships), 10)
+        self.assertEqual(sum(list(row).count('S') for row in self.board.grid), 20)
+
+    def test_place_ships_on_crowded_board(self):
+        board = type(self.board)(5)
+        ships = [Ship(5), Ship(5), Ship(5)]  # Помещаются только через строку или через столбец
+        place_ships_on_board(ships, board)
+        self.assertEqual(sum(list(row).count('S') for row in board.grid), 15)
+
+        with self.assertRaises(ValueError):
+            place_ships_on_board([Ship(5)], board)  # Места больше нет
+
+
+class TestBitBoard(TestBoard):
+
+    def setUp(self):
+        self.board = BitBoard()
+
+    def test_place_random_fleet(self):
+        self.board.place_random_fleet((4, 3, 3, 2, 2, 2, 1, 1, 1, 1))
+        self.assertEqual(self.board.occupied.bit_count(), 20)
+
+        board = BitBoard(3)
+        with self.assertRaises(ValueError):
+            board.place_random_fleet((1, 1, 1, 1, 1), attempts=5)  # Больше четырех не помещается
+        with self.assertRaises(ValueError):
+            board.place_random_fleet((4,))
+
+    def test_play_random_game(self):
+        fleet = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+        shots = [self.board.play_random_game(fleet, random.Random(seed)) for seed in range(50)]
+        self.assertTrue(self.board.all_ships_sunk())
+        self.assertEqual(self.board.shots.bit_count(), shots[-1])
+        self.assertTrue(all(20 <= count <= 100 for count in shots))
+        self.assertEqual(shots, [self.board.play_random_game(fleet, random.Random(seed)) for seed in range(50)])
+        self.assertGreater(sum(shots) / len(shots), 90)  # Последняя из 20 клеток кораблей — в среднем ~96-й выстрел
+        self.assertEqual(BitBoard(3).play_random_game(()), 0)
+
+
+class TestPlacementEngine(unittest.TestCase):
+
+    def test_infeasible_fleet_fails_fast(self):
+        started = time.perf_counter()
+        with self.assertRaises(ValueError):
+            place_ships_on_board([Ship(1) for _ in range(26)], Board(10))  # Больше 25 не помещается
+        with self.assertRaises(ValueError):
+            PlacementEngine(9, [1] * 20).solve([1] * 20, random.Random(1))  # Проходит оценки, но не бюджет
+        self.assertLess(time.perf_counter() - started, 5)
+
+    def test_failed_placement_leaves_board_unchanged(self):
+        board = Board(10)
+        with self.assertRaises(ValueError):
+            place_ships_on_board([Ship(0)] + [Ship(1) for _ in range(26)], board)
+        self.assertEqual(board.ships, [])
+
+    def test_empty_ships_do_not_enable_prefilter(self):
+        board = Board(10)
+        board.place_ship(Ship(0), 0, 0)
+        checked = []
+        is_valid_position = board.is_valid_position
+        board.is_valid_position = lambda positions: checked.append(positions) or is_valid_position(positions)
+
+        place_ships_on_board([Ship(size) for size in (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)], board)
+        self.assertEqual(len(board.ships), 11)
+        self.assertEqual(len(checked), 10)  # Только в `place_ship`: клеток кораблей на доске не было
+
+    def test_identical_ships_are_not_permuted(self):
+        fleet = [4, 4, 4, 1]
+        engine = PlacementEngine(5, fleet)
+        layouts = []
+        mark = engine._mark
+        chosen = []
+
+        def tracking_mark(size, pid, delta):
+            if delta > 0:
+                chosen.append((size, pid))
+                layouts.append(frozenset(chosen))
+            else:
+                chosen.remove((size, pid))
+            mark(size, pid, delta)
+
+        engine._mark = tracking_mark
+        with self.assertRaises(ValueError):
+            engine.solve(fleet, random.Random(1), budget=10**6)  # Полный перебор: флот не помещается
+        self.assertGreater(len(layouts), 50)
+        self.assertEqual(len(layouts), len(set(layouts)))
+
+
+class TestBoardRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Board()
+        self.board.place_ship(Ship(2), 0, 0, horizontal=True)
+
+    def test_render_cache_invalidation(self):
+        self.assertEqual(self.board.render().split("\n")[1], "0 S S" + " " * 16)
+        self.assertEqual(self.board.render(hidden=True).split("\n")[1], "0" + " " * 20)
+
+        self.board.receive_shot(0, 1)
+        self.assertEqual(self.board.render().split("\n")[1], "0 S X" + " " * 16)
+        self.assertEqual(self.board.render(hidden=True).split("\n")[1], "0   X" + " " * 16)
+
+    def test_redraw_repaints_only_changed_cells(self):
+        stream = io.StringIO()
+        self.board.redraw(stream=stream)  # Первая отрисовка — целиком
+
+        stream = io.StringIO()
+        self.board.receive_shot(0, 1)
+        self.board.receive_shot(4, 4)
+        self.board.redraw(stream=stream)
+        self.assertEqual(stream.getvalue(), "\x1b[2;5HX\x1b[6;11HO\x1b[12;1H")
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_simulate_shots_to_win(self):
+        result = simulate(50, HuntTargetTargeter, workers=1, chunk_size=20, seed=1)
+        self.assertEqual(result.games, 50)
+        summary = result.summary()
+        self.assertGreaterEqual(summary["min"], 20)  # Меньше, чем клеток у флота, не бывает
+        self.assertLessEqual(summary["max"], 100)
+
+    def test_probability_targeter(self):
+        result = simulate(20, ProbabilityTargeter, workers=1, seed=3)
+        self.assertEqual(result.games, 20)
+        self.assertLess(result.summary()["mean"], 80)  # Заметно лучше случайной стрельбы
+
+    def test_simulate_is_reproducible(self):
+        first = simulate(30, HuntTargetTargeter, workers=1, chunk_size=10, seed=7)
+        second = simulate(30, HuntTargetTargeter, workers=1, chunk_size=10, seed=7)
+        self.assertEqual(first.histogram, second.histogram)
+
+    def test_simulate_in_processes(self):
+        serial = simulate(40, HuntTargetTargeter, workers=1, chunk_size=10, seed=7)
+        pooled = simulate(40, HuntTargetTargeter, workers=2, chunk_size=10, seed=7)
+        self.assertEqual(pooled.histogram, serial.histogram)
+
+    def test_empty_simulation(self):
+        summary = simulate(0).summary()
+        self.assertEqual(summary["games"], 0)
+        self.assertIsNone(summary["mean"])
+
+
+def decode_record(data):
+    return read_record(io.BytesIO(data))
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Board()
+        self.board.place_ship(Ship(3), 0, 0, horizontal=True)
+        self.board.place_ship(Ship(2), 5, 5, horizontal=False)
+        self.board.receive_shot(0, 0)
+        self.board.receive_shot(9, 9)
+        self.board.receive_shot(5, 5)
+
+    def test_encode_decode_board(self):
+        board = decode_board(encode_board(self.board))
+        self.assertEqual(list(board.grid), list(self.board.grid))
+        self.assertEqual(list(board.shots), list(self.board.shots))
+        self.assertEqual([ship.hits for ship in board.ships], [1, 1])
+
+    def test_replay_log(self):
+        stream = io.BytesIO()
+        with ReplayWriter(stream) as writer:
+            writer.write(self.board)
+            writer.write(self.board)
+
+        stream.seek(0)
+        records = list(ReplayReader(stream))
+        self.assertEqual(len(records), 2)
+
+        result = replay_corpus(records, HuntTargetTargeter)
+        self.assertEqual(result.games, 2)
+
+    def test_empty_ships_are_skipped(self):
+        board = Board()
+        board.place_ship(Ship(0), 0, 0)
+        board.place_ship(Ship(2), 3, 3)
+        record = decode_record(encode_board(board))
+        self.assertEqual(len(record.ship_masks()), 1)
+        self.assertEqual(record.fleet(), (2,))
+        self.assertEqual(replay_corpus([record], HuntTargetTargeter).games, 1)
+
+    def test_corpus_with_different_fleets(self):
+        other = Board()
+        other.place_ship(Ship(3), 0, 0, horizontal=True)
+        other.place_ship(Ship(3), 5, 5, horizontal=False)
+        records = [decode_record(encode_board(board)) for board in (self.board, other)]
+        with self.assertRaises(ValueError):
+            replay_corpus(records, HuntTargetTargeter)
+
+    def test_invalid_log(self):
+        with self.assertRaises(ValueError):
+            ReplayReader(io.BytesIO(b"not a replay log"))
+
+
+def brute_force_occupancy(board_size, ship_sizes, state):
+    """Перебрать расстановки флота напрямую; вернуть их число и занятость клеток.
+
+    Расстановка согласована с `state`, если промахи свободны, попадания заняты, а
+    у каждого корабля есть неизвестная клетка (иначе он был бы потоплен).
+    """
+    placements = {}
+    for size in set(ship_sizes):
+        options = []
+        for row in range(board_size):
+            for col in range(board_size):
+                for horizontal in (True, False) if size > 1 else (True,):
+                    cells = [(row, col + offset) if horizontal else (row + offset, col) for offset in range(size)]
+                    if all(r < board_size and c < board_size for r, c in cells):
+                        halo = {(r + dr, c + dc) for r, c in cells for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+                        options.append(({r * board_size + c for r, c in cells}, halo))
+        placements[size] = options
+
+    sizes = sorted(ship_sizes, reverse=True)
+    occupied = [0] * (board_size * board_size)
+    total = 0
+
+    def place(depth, first, blocked, cells, layout):
+        nonlocal total
+        if depth == len(sizes):
+            if any(state[cell] == EMPTY for cell in cells):
+                return
+            if any(value == HIT and cell not in cells for cell, value in enumerate(state)):
+                return
+            if any(all(state[cell] == HIT for cell in ship) for ship in layout):
+                return
+            total += 1
+            for cell in cells:
+                occupied[cell] += 1
+            return
+
+        options = placements[sizes[depth]]
+        for index in range(first, len(options)):
+            ship, halo = options[index]
+            if any(divmod(cell, board_size) in blocked for cell in ship):
+                continue
+            following = index + 1 if depth + 1 < len(sizes) and sizes[depth + 1] == sizes[depth] else 0
+            place(depth + 1, following, blocked | halo, cells | ship, layout + [ship])
+
+    place(0, 0, set(), set(), [])
+    return total, occupied
+
+
+class TestEnumeration(unittest.TestCase):
+
+    def test_count_small_board(self):
+        enumerator = FleetEnumerator(3, (1, 1))
+        self.assertEqual(enumerator.count(), 16)
+        probabilities = enumerator.probabilities()
+        self.assertAlmostEqual(probabilities[0], 5 / 16)
+        self.assertEqual(probabilities[4], 0)
+
+    def test_count_standard_fleet(self):
+        self.assertEqual(FleetEnumerator(7, (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)).count(), 406664)
+
+    def test_revealed_board(self):
+        board = Board(5)
+        board.place_ship(Ship(2), 0, 0, horizontal=True)
+        board.place_ship(Ship(2), 3, 3, horizontal=False)
+        for row, col in ((0, 0), (0, 1), (2, 2), (3, 3), (4, 0)):
+            board.receive_shot(row, col)
+
+        probabilities = FleetEnumerator(5, (2, 2, 1), board_state(board)).probabilities()
+        self.assertEqual(probabilities[0], 1.0)  # Потопленный корабль
+        self.assertEqual(probabilities[3 * 5 + 3], 1.0)  # Попадание
+        self.assertEqual(probabilities[2 * 5 + 2], 0.0)  # Промах
+        self.assertAlmostEqual(sum(probabilities), 5)  # Клеток у флота
+
+    def test_matches_brute_force(self):
+        rng = random.Random(5)
+        for board_size, fleet in ((4, (2, 1)), (4, (3, 1, 1)), (5, (3, 2, 1)), (5, (2, 2, 1))):
+            for _ in range(8):
+                state = bytearray(rng.choices((UNKNOWN, EMPTY, HIT), (7, 2, 1), k=board_size * board_size))
+                total, occupied = brute_force_occupancy(board_size, fleet, state)
+                enumerator = FleetEnumerator(board_size, fleet, state)
+                self.assertEqual(enumerator.count(), total)
+                if total:
+                    probabilities = enumerator.probabilities()
+                    for cell, ways in enumerate(occupied):
+                        self.assertAlmostEqual(probabilities[cell], ways / total)
+
+    def test_ship_of_hits_only_is_sunk(self):
+        state = bytearray(9)
+        state[4] = HIT  # Однопалубник из одного попадания был бы потоплен
+        self.assertEqual(FleetEnumerator(3, (1,), state).count(), 0)
+
+        state = bytearray(16)
+        state[0] = HIT
+        self.assertEqual(FleetEnumerator(4, (2, 1), state).count(), 20)  # Попадание накрывает двухпалубник
+
+    def test_inconsistent_board(self):
+        state = bytearray(9)
+        state[4] = 2  # Попадание при флоте, которого на доске нет
+        self.assertEqual(FleetEnumerator(3, (), state).count(), 0)
+        with self.assertRaises(ValueError):
+            FleetEnumerator(3, (), state).probabilities()
+
+    def test_exact_targeter(self):
+        result = simulate(3, ExactTargeter, board_size=5, fleet=(3, 2, 1), workers=1, seed=2)
+        self.assertEqual(result.games, 3)
+
+        started = time.perf_counter()
+        result = simulate(2, ExactTargeter, workers=1, seed=2)  # Стандартная доска 10x10
+        self.assertEqual(result.games, 2)
+        self.assertLess(time.perf_counter() - started, 10)
+
+    def test_work_limit(self):
+        with self.assertRaises(TooManyStates):
+            FleetEnumerator(10, (4, 3, 3, 2, 2, 2, 1, 1, 1, 1), max_work=1000).count()
+
 
 if __name__ == '__main__':
     unittest.main()